@@ -0,0 +1,69 @@
+# Measures deck construction time and frame time of the game screen as the board grows.
+# Run from the repository root: python -m benchmarks.board_size
+from argparse import ArgumentParser
+from random import seed
+from statistics import mean, quantiles
+from time import perf_counter_ns
+from pygame import init as init_game
+from pygame.transform import scale
+
+from classes.game_components.Player import Player
+from classes.screens.MemoryGame import MemoryGame
+from classes.state_machine.Engine import Engine
+from utils.preloader import Preloader
+from utils.settings import Decks, Images, Paths
+from utils.support import get_graphics_images_from_folder
+
+
+def measure_board(engine: Engine, game: MemoryGame, board_size: tuple[int, int], frames: int) -> dict:
+    game.board_size = board_size
+
+    start = perf_counter_ns()
+    game.create_deck()
+    deck_ms = (perf_counter_ns() - start) / 1_000_000
+
+    # Turn every other card so the frames draw both faces
+    for card in game.deck.cards[::2]: card.face_up = True
+
+    frame_times: list[float] = []
+    for _ in range(frames):
+        start = perf_counter_ns()
+        engine.step()
+        frame_times.append((perf_counter_ns() - start) / 1_000_000)
+
+    return {
+        'board': f'{board_size[0]}x{board_size[1]}',
+        'cards': len(game.deck.cards),
+        'card_size': game.deck.card_size,
+        'deck_ms': deck_ms,
+        'frame_mean_ms': mean(frame_times),
+        'frame_p95_ms': quantiles(frame_times, n=20)[-1],
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark the game screen across board sizes')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    seed(args.seed)
+    init_game()
+    engine = Engine(headless=True)
+    Preloader().wait()
+    images = get_graphics_images_from_folder(Paths.card_front())
+    players = [Player(0, 'Bench', image=scale(images[0], (Images.size_mid, Images.size_mid)))]
+    game = MemoryGame(engine, players)
+    engine.start(game)
+
+    print(f'{"board":>7} {"cards":>6} {"size":>5} {"deck ms":>9} {"frame ms":>9} {"p95 ms":>8}')
+    for board_size in Decks.board_sizes:
+        result = measure_board(engine, game, board_size, args.frames)
+        print(
+            f'{result["board"]:>7} {result["cards"]:>6} {result["card_size"]:>5} '
+            f'{result["deck_ms"]:>9.2f} {result["frame_mean_ms"]:>9.3f} {result["frame_p95_ms"]:>8.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# Runs fixed, seeded scenarios headlessly and writes the results to a JSON file for comparing commits.
+# Run from the repository root: python -m benchmarks.suite --output bench_results.json
+# Every scenario runs in its own process so startup time and peak memory are measured separately.
+from argparse import ArgumentParser
+from json import dump, dumps, loads
+from platform import python_version
+from random import seed
+from statistics import mean, quantiles
+from subprocess import run, CalledProcessError
+from sys import executable
+from time import perf_counter_ns, time
+from typing import Callable, Optional
+from pygame import MOUSEBUTTONDOWN, init as init_game
+from pygame.event import Event
+from pygame.version import ver as pygame_version
+
+from classes.state_machine.Engine import Engine
+from utils.cache import sound_bank
+from utils.fonts import font_cache
+from utils.preloader import Preloader
+from utils.settings import Mains
+
+
+def click(pos: tuple[int, int]) -> list[Event]:
+    return [Event(MOUSEBUTTONDOWN, pos=pos, button=1)]
+
+
+def timed_step(engine: Engine, frame_times: list[int], events: Optional[list[Event]] = None) -> None:
+    start = perf_counter_ns()
+    engine.step(1, events)
+    frame_times.append(perf_counter_ns() - start)
+
+
+# Each scenario builds its first state, which counts towards startup time, and returns a script that plays the frames
+
+def main_menu_scenario(engine: Engine) -> Callable[[int], list[int]]:
+    from classes.screens.MainMenu import MainMenu
+    engine.start(MainMenu(engine))
+    engine.step()
+
+    def script(frames: int) -> list[int]:
+        frame_times: list[int] = []
+        for _ in range(frames): timed_step(engine, frame_times)
+        return frame_times
+    
+    return script
+
+
+def player_setup_scenario(engine: Engine) -> Callable[[int], list[int]]:
+    from classes.screens.MainMenu import MainMenu
+    from classes.screens.PlayerSetup import PlayerSetup
+    menu = MainMenu(engine)
+    setup = PlayerSetup(engine, 2, menu.table, menu.board_size)
+    engine.start(setup)
+    engine.step()
+
+    def script(frames: int) -> list[int]:
+        # Open the image selector of the first player, it stays open until an image is clicked
+        editor = setup.player_editors[0]
+        engine.step(1, click(editor.player_img_rect.center))
+
+        frame_times: list[int] = []
+        for _ in range(frames): timed_step(engine, frame_times)
+        return frame_times
+    
+    return script
+
+
+def memory_game_scenario(engine: Engine) -> Callable[[int], list[int]]:
+    from classes.screens.MainMenu import MainMenu
+    from classes.screens.MemoryGame import MemoryGame
+    from classes.screens.PlayerSetup import PlayerSetup
+    menu = MainMenu(engine)
+    setup = PlayerSetup(engine, 2, menu.table, menu.board_size)
+    game = MemoryGame(engine, [editor.player for editor in setup.player_editors], menu.board_size)
+    engine.start(game)
+    engine.step()
+
+    def script(frames: int) -> list[int]:
+        pairs: dict[int, list] = {}
+        for card in game.deck.cards: pairs.setdefault(card.id[0], []).append(card)
+
+        # Open both cards of every pair, then click once more to collect it, drawing a frame after each click
+        frame_times: list[int] = []
+        for cards in pairs.values():
+            for card in cards: timed_step(engine, frame_times, click(card.rect.center))
+            timed_step(engine, frame_times, click(cards[0].rect.center))
+
+        for _ in range(max(frames - len(frame_times), 0)): timed_step(engine, frame_times)
+        return frame_times
+    
+    return script
+
+
+SCENARIOS: dict[str, Callable[[Engine], Callable[[int], list[int]]]] = {
+    'main_menu': main_menu_scenario,
+    'player_setup': player_setup_scenario,
+    'memory_game': memory_game_scenario,
+}
+
+
+def get_peak_memory_bytes() -> Optional[int]:
+    try:
+        from resource import getrusage, RUSAGE_SELF
+    except ImportError:
+        return None
+    
+    # ru_maxrss is reported in kilobytes on Linux
+    return getrusage(RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_scenario(name: str, frames: int, random_seed: int) -> dict:
+    seed(random_seed)
+    start = perf_counter_ns()
+    init_game()
+    engine = Engine(headless=True)
+    Preloader().wait()
+    script = SCENARIOS[name](engine)
+    startup_ns = perf_counter_ns() - start
+
+    start = perf_counter_ns()
+    frame_times = script(frames)
+    total_ns = perf_counter_ns() - start
+    cuts = quantiles(frame_times, n=100, method='inclusive')
+
+    return {
+        'frames': len(frame_times),
+        'fps': len(frame_times) / (sum(frame_times) / 1_000_000_000),
+        'wall_time_s': total_ns / 1_000_000_000,
+        'startup_ms': startup_ns / 1_000_000,
+        'frame_mean_ms': mean(frame_times) / 1_000_000,
+        'frame_p50_ms': cuts[49] / 1_000_000,
+        'frame_p95_ms': cuts[94] / 1_000_000,
+        'frame_p99_ms': cuts[98] / 1_000_000,
+        'peak_memory_bytes': get_peak_memory_bytes(),
+        'sounds': sound_bank.stats(),
+        'fonts': font_cache.stats(),
+    }
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (CalledProcessError, OSError):
+        return None
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Run the benchmark scenarios headlessly')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--scenario', choices=SCENARIOS.keys(), action='append', help='Scenario to run, all by default')
+    parser.add_argument('--worker', action='store_true', help='Run a single scenario in this process and print its result')
+    args = parser.parse_args()
+
+    if args.worker:
+        print(dumps(run_scenario(args.scenario[0], args.frames, args.seed)))
+        return
+
+    results: dict[str, dict] = {}
+    for name in args.scenario or SCENARIOS.keys():
+        command = [executable, '-m', 'benchmarks.suite', '--worker', '--scenario', name, '--frames', str(args.frames), '--seed', str(args.seed)]
+        output = run(command, capture_output=True, text=True, check=True).stdout
+        results[name] = loads(output.strip().splitlines()[-1])
+        print(f'{name:>13}: {results[name]["fps"]:8.1f} fps, p95 {results[name]["frame_p95_ms"]:.2f} ms, startup {results[name]["startup_ms"]:.0f} ms')
+
+    with open(args.output, 'w') as file:
+        dump({
+            'commit': get_commit(),
+            'timestamp': time(),
+            'python': python_version(),
+            'pygame': pygame_version,
+            'resolution': Mains.virtual_resolution,
+            'frames': args.frames,
+            'seed': args.seed,
+            'scenarios': results,
+        }, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
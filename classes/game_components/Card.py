@@ -1,7 +1,10 @@
+from typing import Optional
 from pygame import Rect, Surface
+from pygame.draw import rect as draw_rect
 from pygame.mixer import Sound
 
-from utils.settings import Paths, Sounds
+from utils.cache import sound_bank
+from utils.settings import Cards, Sounds
 
 class Card:
     def __init__(
@@ -9,18 +12,39 @@ class Card:
             id: tuple, 
             front_img: Surface, 
             back_img: Surface,
+            found_img: Optional[Surface] = None,
             ) -> None:
         self.front_img = front_img
         self.back_img = back_img
+        self.found_img = found_img if found_img is not None else front_img
 
         self.id = id
         self.found_pair: bool = False
-        self.selected_img: Surface = self.back_img if not self.found_pair else self.front_img
+        self.face_up: bool = False
         self.rect: Rect = self.selected_img.get_rect()
-        self.turn_sound = Sound(Paths.sound(Sounds.turn))
-        self.pair_sound = Sound(Paths.sound(Sounds.pair))
+        self.turn_sound: Sound = sound_bank.get(Sounds.turn)
+        self.pair_sound: Sound = sound_bank.get(Sounds.pair)
+
+
+    # Draws the card border onto a face texture owned by the deck, never onto a shared source image
+    @staticmethod
+    def bake(img: Surface, border_color: str) -> Surface:
+        draw_rect(img, border_color, img.get_rect(), Cards.border_width)
+        return img
+    
+
+    @property
+    def selected_img(self) -> Surface:
+        if self.found_pair: return self.found_img
+        return self.front_img if self.face_up else self.back_img
+        
         
     def turn(self) -> None:
         sound = self.pair_sound if self.found_pair else self.turn_sound
         sound.play()
-        self.selected_img = self.front_img if self.selected_img != self.front_img else self.back_img
\ No newline at end of file
+        self.face_up = not self.face_up
+
+
+    def reset(self) -> None:
+        self.found_pair = False
+        self.face_up = False
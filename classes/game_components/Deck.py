@@ -1,9 +1,10 @@
 from pygame import Surface
-from pygame.draw import rect as draw_rect
-from typing import List
+from random import shuffle
+from typing import List, Optional
 
 from classes.game_components.Card import Card
-from utils.settings import Cards, Colors, Decks
+from utils.render_queue import render_queue
+from utils.settings import Cards, Decks, Layers
 
 
 class Deck:
@@ -11,37 +12,81 @@ class Deck:
             self,
             display_surface: Surface,
             cards: List[Card],
+            rows: int = Decks.num_rows,
+            cols: int = Decks.num_columns,
+            card_size: int = Cards.size,
             ) -> None:
         self.display_surface: Surface = display_surface
         self.cards: List[Card] = cards
         self.open_cards: List[Card] = []
+        self.rows = rows
+        self.cols = cols
+        self.card_size = card_size
 
+        self.grid: List[List[Optional[Card]]] = []
+        self.layout_size: tuple[int, int] = (0, 0)
+        self.x_start: int = 0
+        self.y_start: int = 0
+        self.cell_size: int = card_size + Decks.padding
 
-    def draw(self, screen_width: int, screen_height: int):
-        display_cards: List[Card] = self.cards.copy()
-        rows = Decks.num_rows
-        cols = Decks.num_columns
-        card_size = Cards.size
-        margin = Decks.padding
+        self.layout(display_surface.get_width(), display_surface.get_height())
+
+
+    # Largest card size, capped at Cards.size, that fits the board between the player views
+    @staticmethod
+    def get_card_size(rows: int, cols: int, screen_width: int, screen_height: int) -> int:
         padding = Decks.padding
-        x_start = (screen_width // 2) - ((card_size * cols) + ((cols - 1) * padding)) // 2 - margin
-        y_start = (screen_height // 2) - ((card_size * cols) + ((cols - 1) * padding)) // 2 - margin
+        area_width = screen_width - 2 * (screen_width // Decks.player_view_divider)
+        area_height = screen_height - 2 * padding
+        fit_width = (area_width - (cols - 1) * padding) // cols
+        fit_height = (area_height - (rows - 1) * padding) // rows
+        return max(1, min(Cards.size, fit_width, fit_height))
+
+
+    # Places the cards on a grid centered on the screen and stores it for drawing and hit-testing
+    def layout(self, screen_width: int, screen_height: int) -> None:
+        rows = self.rows
+        cols = self.cols
+        card_size = self.card_size
+        padding = Decks.padding
+        self.cell_size = card_size + padding
+        self.x_start = (screen_width // 2) - ((card_size * cols) + ((cols - 1) * padding)) // 2
+        self.y_start = (screen_height // 2) - ((card_size * rows) + ((rows - 1) * padding)) // 2
+        self.layout_size = (screen_width, screen_height)
+        self.grid = [[None] * cols for _ in range(rows)]
+
+        for index, card in enumerate(self.cards[:rows * cols]):
+            row, col = divmod(index, cols)
+            x = self.x_start + col * self.cell_size
+            y = self.y_start + row * self.cell_size
+            card.rect = card.selected_img.get_rect(topleft=(x, y))
+            self.grid[row][col] = card
+
+
+    # Deals the same cards face down in a new order, keeping their surfaces and sounds
+    def shuffle(self) -> None:
+        shuffle(self.cards)
+        for card in self.cards: card.reset()
+        self.open_cards.clear()
+        self.layout(*self.layout_size)
+
+
+    # Maps a screen position to the card under it, or None when the position is outside the cards
+    def card_at(self, pos: tuple[int, int]) -> Optional[Card]:
+        x = pos[0] - self.x_start
+        y = pos[1] - self.y_start
+        if x < 0 or y < 0: return None
+
+        col, x_offset = divmod(x, self.cell_size)
+        row, y_offset = divmod(y, self.cell_size)
+        if row >= self.rows or col >= self.cols: return None
+        if x_offset >= self.card_size or y_offset >= self.card_size: return None
         
-        for row in range(rows):
-            for col in range(cols):
-                x = x_start + margin + col * (card_size + padding)
-                y = y_start + margin + row * (card_size + padding)
-
-                card = display_cards.pop()
-                # print(card.selected_img.get_rect(topleft=(x, y)))
-                card.rect = card.selected_img.get_rect(topleft=(x, y))
-                draw_rect(
-                    card.selected_img, 
-                    Colors.active if card.found_pair else Colors.border, 
-                    card.selected_img.get_rect(), 
-                    Cards.border_width
-                    )
-                
-                self.display_surface.blit(card.selected_img, (x, y))
+        return self.grid[row][col]
 
 
+    def draw(self, screen_width: int, screen_height: int):
+        if self.layout_size != (screen_width, screen_height):
+            self.layout(screen_width, screen_height)
+        
+        render_queue.submit_many([(card.selected_img, card.rect) for card in self.cards], Layers.board)
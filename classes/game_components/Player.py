@@ -1,5 +1,5 @@
 from typing import Optional
-from pygame import Surface
+from pygame import Rect, Surface
 
 from classes.screen_items.ImageDisplay import ImageDisplay
 from classes.screen_items.TextDisplay import TextDisplay
@@ -28,7 +28,15 @@ class Player:
     
     def add_points(self):
         self.score += Games.points_per_pair
-        self.__set_score_display()
+        self.__update_score_text()
+
+
+    # Clears the results of a game, updating the score display in place if the view is already set
+    def reset(self) -> None:
+        self.score = 0
+        self.active = False
+        self.turns = 0
+        self.__update_score_text()
 
 
     def set_display_surface(self, display_surface: Surface) -> None:
@@ -42,6 +50,15 @@ class Player:
         self.__set_score_display()
 
 
+    # Areas covered by the player's image, name and score on the game screen
+    def get_view_rects(self) -> list[Rect]:
+        return [
+            self.image.get_rect(topleft=self.image_display.position),
+            self.name_display.get_rect(),
+            self.score_display.get_rect(),
+        ]
+
+
     def __set_image_display(self) -> None:
         view_x_pos = self.__get_view_x_position()
         pos_x = view_x_pos - self.image.get_width() // 2
@@ -75,6 +92,11 @@ class Player:
         )
 
 
+    # Only the text changes, the display keeps its position and renders the new score through the text cache
+    def __update_score_text(self) -> None:
+        if self.score_display: self.score_display.text = f'Score: {self.score}'
+
+
     def __get_view_x_position(self) -> int:
         screen_width = self.display_surface.get_width()
         player_1_name_pos_x: tuple = screen_width // 8
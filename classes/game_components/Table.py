@@ -1,6 +1,8 @@
+from typing import Optional
 from pygame import Surface
 
-from utils.settings import Tables, Mains
+from utils.render_queue import render_queue
+from utils.settings import Colors, Layers, Tables
 
 
 class Table:
@@ -11,9 +13,29 @@ class Table:
             ) -> None:
         self.display_surface: Surface = display_surface
         self.img = img
+        self.background: Optional[Surface] = None
+
+        self.__bake()
+
+
+    def set_texture(self, img: Surface) -> None:
+        self.img = img
+        self.__bake()
 
     
     def draw(self) -> None:
-        for y in range(0, Mains.height, Tables.texture_size):
-            for x in range(0, Mains.width, Tables.texture_size):
-                self.display_surface.blit(self.img, (x, y))
+        if self.background.get_size() != self.display_surface.get_size():
+            self.__bake()
+
+        render_queue.submit(self.background, (0, 0), Layers.background)
+
+
+    # Tiles the texture once into a surface matching the display resolution
+    def __bake(self) -> None:
+        width, height = self.display_surface.get_size()
+        self.background = Surface((width, height)).convert()
+        self.background.fill(Colors.background)
+
+        for y in range(0, height, Tables.texture_size):
+            for x in range(0, width, Tables.texture_size):
+                self.background.blit(self.img, (x, y))
@@ -1,11 +1,12 @@
 from typing import Callable, Optional
 from pygame import Surface
-from pygame.draw import rect as draw_rect
 from pygame.font import Font
 from pygame.mixer import Sound
 from pygame.rect import Rect
 
-from utils.settings import Cards, Colors, Paths, Sounds
+from utils.cache import sound_bank, text_cache
+from utils.render_queue import render_queue
+from utils.settings import Cards, Colors, Layers, Sounds
 
 
 class Button:
@@ -30,7 +31,7 @@ class Button:
         
         self.active: bool = False
         self.rect: Optional[Rect] = None
-        self.sound = Sound(Paths.sound(Sounds.button))
+        self.sound: Sound = sound_bank.get(Sounds.button)
 
         self.__init()
 
@@ -51,34 +52,27 @@ class Button:
         self.active = value
 
 
-    def draw_clickable(self, display: Surface, get_active: Callable) -> Surface:
+    def draw_clickable(self, get_active: Callable, layer: int = Layers.ui) -> None:
         self.active = get_active().id == self.id
         color = self.active_color if self.active else self.passive_color
-        value: Surface = self.font_style.render(str(self.text), True, color)
+        border_width = Cards.border_width if self.border_visible else 0
+        value: Surface = text_cache.render(self.font_style, str(self.text), color, border_width=border_width)
         self.rect: Rect = value.get_rect(center=self.position)
 
-        if self.border_visible: 
-            draw_rect(
-            value, 
-            color, 
-            value.get_rect(), 
-            Cards.border_width
-        )
+        render_queue.submit(value, self.rect, layer)
 
-        display.blit(value, self.rect)
 
-
-    def draw_hoverable(self, display: Surface) -> Surface:
+    def draw_hoverable(self, layer: int = Layers.ui) -> None:
         color = self.active_color if self.active else self.passive_color
-        value: Surface = self.font_style.render(str(self.text), True, color)
+        value: Surface = text_cache.render(self.font_style, str(self.text), color)
         self.rect: Rect = value.get_rect(center=self.position)
-        display.blit(value, self.rect)
+        render_queue.submit(value, self.rect, layer)
         
 
-    def draw_basic(self, display: Surface, color: str = Colors.active) -> None:
-        value: Surface = self.font_style.render(str(self.text), True, color)
+    def draw_basic(self, color: str = Colors.active, layer: int = Layers.ui) -> None:
+        value: Surface = text_cache.render(self.font_style, str(self.text), color)
         value_rect: Rect = value.get_rect(center=self.position)
 
         self.rect = value_rect
 
-        display.blit(value, value_rect)
\ No newline at end of file
+        render_queue.submit(value, value_rect, layer)
\ No newline at end of file
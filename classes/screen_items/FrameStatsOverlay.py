@@ -0,0 +1,63 @@
+from typing import Optional
+from pygame import Rect, Surface
+
+from classes.state_machine.FrameStats import FrameStats
+from utils.render_queue import render_queue
+from utils.settings import Colors, Fonts, Profiling
+
+
+# Shows frame phase percentiles of the current state in the top left corner.
+# The panel is re-rendered only a few times a second and has a fixed size, so each frame is a single blit.
+class FrameStatsOverlay:
+    def __init__(
+            self,
+            display_surface: Surface,
+            frame_stats: FrameStats,
+            ) -> None:
+        self.display_surface = display_surface
+        self.frame_stats = frame_stats
+        self.font = Fonts.overlay()
+        
+        self.visible: bool = False
+        self.last_refresh: Optional[int] = None
+        self.panel: Optional[Surface] = None
+        self.rect: Optional[Rect] = None
+
+        self.__init()
+
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+        self.last_refresh = None
+
+
+    def draw(self, state_name: str, ticks: int) -> None:
+        if self.last_refresh is None or ticks - self.last_refresh >= Profiling.overlay_refresh_ms:
+            self.__refresh(state_name)
+            self.last_refresh = ticks
+
+        self.display_surface.blit(self.panel, self.rect)
+
+
+    def __init(self) -> None:
+        padding = Profiling.overlay_padding
+        line_width, _ = self.font.size(self.__get_line('machine', (999.99, 999.99, 999.99)))
+        lines = len(Profiling.phases) + 3
+        self.rect = Rect(padding, padding, line_width + 2 * padding, lines * self.font.get_linesize() + 2 * padding)
+        self.panel = Surface(self.rect.size)
+
+
+    def __refresh(self, state_name: str) -> None:
+        padding = Profiling.overlay_padding
+        lines = [state_name, f'{"phase":<8}{"p50":>8}{"p95":>8}{"p99":>8}']
+        lines += [self.__get_line(phase, self.frame_stats.percentiles(state_name, phase)) for phase in Profiling.phases]
+        lines.append(f'draw calls {render_queue.draw_calls}, commands {render_queue.commands}')
+
+        self.panel.fill(Colors.border)
+        for index, line in enumerate(lines):
+            text = self.font.render(line, True, Colors.text)
+            self.panel.blit(text, (padding, padding + index * self.font.get_linesize()))
+
+
+    def __get_line(self, phase: str, values: tuple[float, float, float]) -> str:
+        return f'{phase:<8}' + ''.join(f'{value:>8.2f}' for value in values)
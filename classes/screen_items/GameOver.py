@@ -1,10 +1,10 @@
 from typing import Optional
 from pygame import Surface, Rect
-from pygame.draw import rect as draw_rect
 
 from classes.screen_items.Button import Button
 from classes.game_components.Player import Player
-from utils.settings import Buttons, Colors, Fonts
+from utils.render_queue import render_queue
+from utils.settings import Buttons, Colors, Fonts, Layers
 
 
 class GameOver:
@@ -60,20 +60,20 @@ class GameOver:
 
 
     def draw(self) -> None:
-        self.display_surface.blit(self.screen_bg, self.screen_bg_rect)
-        draw_rect(self.display_surface, Colors.active, self.screen_bg_rect, 2)
+        render_queue.submit(self.screen_bg, self.screen_bg_rect, Layers.modal)
+        render_queue.submit_outline(Colors.active, self.screen_bg_rect, 2, Layers.modal)
         padding_y = 20
         padding_x = 100
         center = self.screen_bg_rect.center
 
         headline_y = self.screen_bg_rect.top + padding_y
-        self.display_surface.blit(self.headline_field, self.headline_field.get_rect(center=center, top=headline_y))
+        render_queue.submit(self.headline_field, self.headline_field.get_rect(center=center, top=headline_y), Layers.modal)
 
         result_y = headline_y + self.headline_field.get_height() + padding_y
-        self.display_surface.blit(self.result_field, self.result_field.get_rect(center=center, top=result_y))
+        render_queue.submit(self.result_field, self.result_field.get_rect(center=center, top=result_y), Layers.modal)
 
-        self.new_game_button.draw_hoverable(self.display_surface)
-        self.back_button.draw_hoverable(self.display_surface)
+        self.new_game_button.draw_hoverable(Layers.modal)
+        self.back_button.draw_hoverable(Layers.modal)
 
         player_area_width = self.screen_bg_rect.width - 2 * padding_x
         player_spacing = player_area_width // (len(self.players) + 1)
@@ -85,15 +85,15 @@ class GameOver:
             
             # Draw player image
             player_image_y = base_y + player.image.get_height() // 2
-            self.display_surface.blit(player.image, player.image.get_rect(center=(player_x, player_image_y)))
+            render_queue.submit(player.image, player.image.get_rect(center=(player_x, player_image_y)), Layers.modal)
             
             # Draw player name
             player_name_y = player_image_y + player.image.get_height() // 2 + padding_y
-            self.display_surface.blit(self.player_name_fields[i], self.player_name_fields[i].get_rect(center=(player_x, player_name_y)))
+            render_queue.submit(self.player_name_fields[i], self.player_name_fields[i].get_rect(center=(player_x, player_name_y)), Layers.modal)
             
             # Draw player score
             player_score_y = player_name_y + self.player_name_fields[i].get_height() + padding_y
-            self.display_surface.blit(self.player_score_fields[i], self.player_score_fields[i].get_rect(center=(player_x, player_score_y)))
+            render_queue.submit(self.player_score_fields[i], self.player_score_fields[i].get_rect(center=(player_x, player_score_y)), Layers.modal)
 
 
     def populate(self) -> None:
@@ -1,7 +1,7 @@
 from pygame import Surface
-from pygame.draw import rect as draw_rect
 
-from utils.settings import Colors, Images, Fonts
+from utils.render_queue import render_queue
+from utils.settings import Colors, Images, Fonts, Layers
 
 
 class ImageDisplay:
@@ -19,14 +19,8 @@ class ImageDisplay:
         self.position = position
 
 
-    def draw(self, active: bool) -> None:
+    def draw(self, active: bool, layer: int = Layers.ui) -> None:
         color = Colors.active if active else Colors.passive
-        self.image.get_rect(center=self.position)
-        draw_rect(
-            self.image,
-            color,
-            self.image.get_rect(),
-            2
-        )
-
-        self.display_surface.blit(self.image, self.position)
\ No newline at end of file
+        image_rect = self.image.get_rect(topleft=self.position)
+        render_queue.submit(self.image, image_rect, layer)
+        render_queue.submit_outline(color, image_rect, 2, layer)
\ No newline at end of file
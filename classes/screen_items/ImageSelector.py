@@ -0,0 +1,102 @@
+from typing import Optional
+from pygame import Rect, Surface
+
+from utils.render_queue import render_queue
+from utils.settings import Colors, Images, Layers, Selectors
+
+
+# Grid of image thumbnails rendered once into a panel surface, of which only the scrolled to rows are shown.
+# Positions map to image indexes with grid arithmetic, so neither drawing nor clicking depends on the number of images.
+class ImageSelector:
+    def __init__(
+            self,
+            display_surface: Surface,
+            images: list[Surface],
+            image_size: int = Images.size_small
+            ) -> None:
+        self.display_surface = display_surface
+        self.screen_width = display_surface.get_width()
+        self.screen_height = display_surface.get_height()
+        self.images = images
+        self.image_size = image_size
+        self.cell_size = image_size + Selectors.padding
+
+        self.columns: int = 1
+        self.rows: int = 0
+        self.visible_rows: int = 0
+        self.scroll_row: int = 0
+        self.grid_rect: Optional[Rect] = None
+        self.view_rect: Optional[Rect] = None
+        self.panel: Optional[Surface] = None
+        self.view: Optional[Surface] = None
+
+        self.__init()
+
+
+    def draw(self) -> None:
+        render_queue.submit(self.view, self.view_rect, Layers.modal)
+        render_queue.submit_outline(Colors.active, self.view_rect, Selectors.border_width, Layers.modal)
+
+        if self.rows > self.visible_rows:
+            render_queue.submit_fill(Colors.passive, self.__get_scrollbar_rect(), Layers.modal)
+
+
+    # Index of the image under the position, or None for positions between or outside the images
+    def index_at(self, pos: tuple[int, int]) -> Optional[int]:
+        if not self.view_rect.collidepoint(pos): return None
+
+        x = pos[0] - self.grid_rect.x
+        y = pos[1] - self.grid_rect.y
+        if x < 0 or y < 0: return None
+
+        col, x_offset = divmod(x, self.cell_size)
+        row, y_offset = divmod(y, self.cell_size)
+        if col >= self.columns or row >= self.visible_rows: return None
+        if x_offset >= self.image_size or y_offset >= self.image_size: return None
+
+        index = (self.scroll_row + row) * self.columns + col
+        return index if index < len(self.images) else None
+
+
+    # Scrolls by whole rows, positive amounts moving towards the first row like the mouse wheel does
+    def scroll(self, amount: int) -> None:
+        last_row = max(self.rows - self.visible_rows, 0)
+        scroll_row = min(max(self.scroll_row - amount * Selectors.scroll_rows, 0), last_row)
+        if scroll_row == self.scroll_row: return
+
+        self.scroll_row = scroll_row
+        self.__set_view()
+
+
+    def __init(self) -> None:
+        padding = Selectors.padding
+        cell_size = self.cell_size
+        self.columns = max(1, (self.screen_width // Selectors.width_divider) // cell_size)
+        self.rows = (len(self.images) + self.columns - 1) // self.columns
+
+        # The grid starts a fifth down the screen and may take three fifths of its height before it scrolls
+        start_y = self.screen_height // 5
+        self.visible_rows = max(1, min(self.rows, (self.screen_height - 2 * start_y) // cell_size))
+
+        start_x = (self.screen_width - (self.columns * cell_size - padding)) // 2
+        self.grid_rect = Rect(start_x, start_y, self.columns * cell_size - padding, self.visible_rows * cell_size - padding)
+        self.view_rect = Rect(start_x - padding // 2, start_y - padding // 2, self.columns * cell_size, self.visible_rows * cell_size)
+
+        # Every thumbnail is drawn once, with the same margins around it as in the view
+        self.panel = Surface((self.columns * cell_size, max(self.rows, 1) * cell_size)).convert()
+
+        for index, image in enumerate(self.images):
+            row, col = divmod(index, self.columns)
+            self.panel.blit(image, (padding // 2 + col * cell_size, padding // 2 + row * cell_size))
+
+        self.__set_view()
+
+
+    def __set_view(self) -> None:
+        self.view = self.panel.subsurface((0, self.scroll_row * self.cell_size, self.view_rect.width, self.view_rect.height))
+
+
+    def __get_scrollbar_rect(self) -> Rect:
+        height = max(self.view_rect.height * self.visible_rows // self.rows, Selectors.scrollbar_width)
+        top = self.view_rect.top + (self.view_rect.height - height) * self.scroll_row // (self.rows - self.visible_rows)
+        return Rect(self.view_rect.right - Selectors.scrollbar_width - Selectors.border_width, top, Selectors.scrollbar_width, height)
@@ -0,0 +1,66 @@
+from random import randrange
+from typing import Optional
+from numpy import float64, flatnonzero, ndarray, zeros
+from numpy.random import Generator, default_rng
+from pygame import Surface
+
+from utils.render_queue import render_queue
+from utils.settings import Layers
+
+
+# Fixed pool of falling sprites whose positions and speeds are stored in arrays and updated in one vectorized step.
+# Particles that fall below the screen are recycled at the top with a new position, speed and one of the shared sprites.
+class ParticleSystem:
+    def __init__(
+            self,
+            display_surface: Surface,
+            sprite_variants: list[Surface],
+            amount: int,
+            sprite_size: int,
+            speed_range: tuple[int, int] = (1, 4),
+            ) -> None:
+        self.display_surface = display_surface
+        self.sprite_variants = sprite_variants
+        self.amount = amount
+        self.sprite_size = sprite_size
+        self.speed_range = speed_range
+        self.screen_width = display_surface.get_width()
+        self.screen_height = display_surface.get_height()
+
+        # Seeded from the random module so seeded runs animate the same way
+        self.rng: Generator = default_rng(randrange(2 ** 32))
+        self.x: ndarray = zeros(amount, dtype=float64)
+        self.y: ndarray = zeros(amount, dtype=float64)
+        self.previous_y: ndarray = zeros(amount, dtype=float64)
+        self.speeds: ndarray = zeros(amount, dtype=float64)
+        self.sprites: list[Optional[Surface]] = [None] * amount
+
+        self.__spawn(self.rng.permutation(amount), spread=True)
+
+
+    def update(self) -> None:
+        self.previous_y[:] = self.y
+        self.y += self.speeds
+
+        expired = flatnonzero(self.y > self.screen_height + self.sprite_size + 1)
+        if expired.size: self.__spawn(expired)
+
+
+    # Draws every particle between its last two positions
+    def draw(self, interpolation: float = 1.0) -> None:
+        y = self.previous_y + (self.y - self.previous_y) * interpolation
+        render_queue.submit_many(zip(self.sprites, zip(self.x.tolist(), y.tolist())), Layers.effects)
+
+
+    # New particles start above the screen, or anywhere on it when the system is first filled
+    def __spawn(self, indexes: ndarray, spread: bool = False) -> None:
+        start_y = -1 - self.sprite_size - self.sprite_size // 2
+        low_speed, high_speed = self.speed_range
+
+        self.x[indexes] = self.rng.integers(0, self.screen_width, indexes.size) - self.sprite_size // 2
+        self.y[indexes] = self.rng.integers(start_y, self.screen_height, indexes.size) if spread else start_y
+        self.previous_y[indexes] = self.y[indexes]
+        self.speeds[indexes] = self.rng.integers(low_speed, high_speed + 1, indexes.size)
+
+        variants = self.rng.integers(0, len(self.sprite_variants), indexes.size)
+        for index, variant in zip(indexes.tolist(), variants.tolist()): self.sprites[index] = self.sprite_variants[variant]
@@ -1,11 +1,11 @@
-from typing import Callable, List, Optional
-from pygame import K_BACKSPACE, KEYDOWN, MOUSEBUTTONDOWN, TEXTINPUT, Rect, Surface
-from pygame.draw import rect as draw_rect
+from typing import List, Optional
+from pygame import BUTTON_LEFT, K_BACKSPACE, KEYDOWN, MOUSEBUTTONDOWN, MOUSEWHEEL, TEXTINPUT, Rect, Surface
 from pygame.event import Event
-from pygame.transform import scale
 
 from classes.game_components.Player import Player
-from utils.settings import Colors, Images, Fonts
+from classes.screen_items.ImageSelector import ImageSelector
+from utils.render_queue import render_queue
+from utils.settings import Colors, Fonts
 
 
 class PlayerDetailEditor:
@@ -13,7 +13,8 @@ class PlayerDetailEditor:
             self, 
             display_surface: Surface,
             player: Player,
-            player_images: List[Surface],
+            image_selector: ImageSelector,
+            player_portraits: List[Surface],
             player_amount: int
             ) -> None:
         
@@ -21,7 +22,8 @@ class PlayerDetailEditor:
         self.screen_width = display_surface.get_width()
         self.screen_height = display_surface.get_height()
         self.player = player
-        self.player_images = player_images
+        self.image_selector = image_selector
+        self.player_portraits = player_portraits
         self.player_amount = player_amount
         self.name_editor_font = Fonts.medium()
 
@@ -45,52 +47,33 @@ class PlayerDetailEditor:
         # self.name_editor_rect.width = self.editor_bg_rect.width - 10
         self.name_editor_rect.x = self.editor_bg_rect.x + (self.editor_bg_rect.width - self.name_editor_rect.width) // 2
 
-        self.display_surface.blit(self.editor_bg_surface, self.editor_bg_rect)
-        draw_rect(self.display_surface, Colors.passive, self.editor_bg_rect, border_width)
+        render_queue.submit(self.editor_bg_surface, self.editor_bg_rect)
+        render_queue.submit_outline(Colors.passive, self.editor_bg_rect, border_width)
         
-        self.display_surface.blit(self.player.image, self.player_img_rect)
-        draw_rect(self.display_surface, Colors.passive, self.player_img_rect, border_width)
+        render_queue.submit(self.player.image, self.player_img_rect)
+        render_queue.submit_outline(Colors.passive, self.player_img_rect, border_width)
 
         if self.name_input_active:
-            self.display_surface.blit(self.active_name_editor_border, self.active_name_editor_border_rect)
-            draw_rect(self.display_surface, name_editor_border_color, self.active_name_editor_border_rect, border_width)
-        self.display_surface.blit(self.name_editor_surface, self.name_editor_rect)
+            render_queue.submit(self.active_name_editor_border, self.active_name_editor_border_rect)
+            render_queue.submit_outline(name_editor_border_color, self.active_name_editor_border_rect, border_width)
+        render_queue.submit(self.name_editor_surface, self.name_editor_rect)
 
     
-    def draw_image_selector(self, set_active_image_selector: Callable, latest_mouse_event: Event, cooldown: bool):
-        padding = 10
-        image_size = Images.size_small
-        images_per_row = (self.screen_width // 3) // (image_size + padding)
-        row_count = (len(self.player_images) + images_per_row - 1) // images_per_row
-        
-        start_x = (self.screen_width - (images_per_row * (image_size + padding) - padding)) // 2
-        start_y = self.screen_height // 5
-        
-        img_select_bg_rect = Rect(
-            start_x - padding // 2, 
-            start_y - padding // 2, 
-            images_per_row * (image_size + padding), 
-            row_count * (image_size + padding)
-            )
-        
-        self.display_surface.blit(Surface(img_select_bg_rect.size), img_select_bg_rect)
-        draw_rect(self.display_surface, Colors.active, img_select_bg_rect, 2)
-        for idx, image in enumerate(self.player_images):
-            
-            col = idx % images_per_row
-            row = idx // images_per_row
-            x = start_x + col * (image_size + padding)
-            y = start_y + row * (image_size + padding)
-            image_rect = Rect(x, y, image_size, image_size)
-            
-            self.display_surface.blit(scale(image, (image_size, image_size)), (x, y))
-            if latest_mouse_event and latest_mouse_event.type == MOUSEBUTTONDOWN and not cooldown:
-                if image_rect.collidepoint(latest_mouse_event.pos):
-                    player_image_size = (Images.size_mid, Images.size_mid)
-                    self.player.image = scale(image, player_image_size)
-                    set_active_image_selector(None)
-                    self.image_selector_active = False
-                    return           
+    def draw_image_selector(self) -> None:
+        self.image_selector.draw()
+
+
+    # Scrolls the selector or picks the portrait of the clicked thumbnail, closing the selector
+    def handle_image_selection(self, event: Event) -> None:
+        if event.type == MOUSEWHEEL:
+            self.image_selector.scroll(event.y)
+
+        if event.type == MOUSEBUTTONDOWN and event.button == BUTTON_LEFT:
+            index: Optional[int] = self.image_selector.index_at(event.pos)
+            if index is None: return
+
+            self.player.image = self.player_portraits[index]
+            self.image_selector_active = False
                 
     
     def handle_name_input(self, event: Event):
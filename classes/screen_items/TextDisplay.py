@@ -1,8 +1,9 @@
 from pygame import Surface, Rect
-from pygame.draw import rect as draw_rect
 from pygame.font import Font
 
-from utils.settings import Cards, Colors
+from utils.cache import text_cache
+from utils.render_queue import render_queue
+from utils.settings import Cards, Colors, Layers
 
 class TextDisplay:
     def __init__(
@@ -15,21 +16,27 @@ class TextDisplay:
         self.font_style = font_style
         self.position = position
 
+    def get_rect(self) -> Rect:
+        rect = Rect((0, 0), self.font_style.size(str(self.text)))
+        rect.center = self.position
+        return rect
+
+
     # Draws basic texts on display
-    def draw_static(self, display: Surface, color: str | tuple[int, int, int]) -> None:
-        value: Surface = self.font_style.render(str(self.text), True, color)
+    def draw_static(self, color: str | tuple[int, int, int], layer: int = Layers.ui) -> None:
+        value: Surface = text_cache.render(self.font_style, str(self.text), color)
         value_rect: Rect = value.get_rect(center=self.position)
-        display.blit(value, value_rect)
+        render_queue.submit(value, value_rect, layer)
 
 
-    def draw(self, display: Surface, active: bool) -> None:
+    def draw(self, active: bool, layer: int = Layers.ui) -> None:
         color = Colors.active if active else Colors.passive
-        value: Surface = self.font_style.render(str(self.text), True, color, Colors.border)
-        value_rect: Rect = value.get_rect(center=self.position)
-        draw_rect(
-            value, 
-            Colors.active if active else Colors.passive, 
-            value.get_rect(), 
-            Cards.border_width
+        value: Surface = text_cache.render(
+            self.font_style, 
+            str(self.text), 
+            color, 
+            background=Colors.border, 
+            border_width=Cards.border_width
         )
-        display.blit(value, value_rect)
\ No newline at end of file
+        value_rect: Rect = value.get_rect(center=self.position)
+        render_queue.submit(value, value_rect, layer)
\ No newline at end of file
@@ -0,0 +1,68 @@
+from pygame import Rect, Surface
+from typing import Optional
+
+from classes.screen_items.TextDisplay import TextDisplay
+from classes.state_machine.Engine import Engine
+from classes.state_machine.State import State
+from utils.preloader import Preloader
+from utils.render_queue import render_queue
+from utils.settings import Colors, Fonts, Preloads, Screens
+
+
+# Splash screen shown while the preloader decodes the assets in the background.
+# The next state is only created once everything is in the caches, so building it loads nothing from disk.
+class Loading(State):
+    animating = True
+
+    def __init__(self, engine: Engine, next_state_id: int = Screens.main_menu_id):
+        super().__init__(engine=engine)
+
+        self.id: int = Screens.loading_id
+        self.next_state_id: int = next_state_id
+        self.display_surface: Surface = self.engine.screen
+        self.screen_width: int = self.display_surface.get_width()
+        self.screen_height: int = self.display_surface.get_height()
+
+        self.preloader: Optional[Preloader] = None
+        self.headline: Optional[TextDisplay] = None
+        self.bar_rect: Optional[Rect] = None
+        self.finished: bool = False
+
+        self.init()
+
+
+    def init(self) -> None:
+        center = self.screen_width // 2
+        center_y = self.screen_height // 2
+
+        self.headline = TextDisplay('Loading', Fonts.medium(), (center, center_y - Fonts.padding_top))
+        self.bar_rect = Rect(0, 0, Preloads.bar_width, Preloads.bar_height)
+        self.bar_rect.center = (center, center_y)
+        self.enter(next_state_id=self.next_state_id)
+
+
+    def enter(self, next_state_id: int = Screens.main_menu_id) -> None:
+        self.next_state_id = next_state_id
+        self.finished = False
+        self.preloader = Preloader()
+        self.preloader.start()
+
+
+    def release(self) -> None:
+        self.preloader = None
+
+
+    def update(self) -> None:
+        if self.finished or not self.preloader.poll(): return
+
+        self.finished = True
+        self.engine.machine.replace(self.next_state_id)
+
+
+    def draw(self) -> None:
+        progress_rect = self.bar_rect.copy()
+        progress_rect.width = round(self.bar_rect.width * self.preloader.get_progress())
+
+        self.headline.draw_static(Colors.active)
+        render_queue.submit_fill(Colors.passive, progress_rect)
+        render_queue.submit_outline(Colors.active, self.bar_rect, 1)
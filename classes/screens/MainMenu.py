@@ -1,33 +1,24 @@
-from dataclasses import dataclass
-from random import choice, randint, randrange
+from random import choice
 from pygame import BLEND_RGBA_MULT, MOUSEMOTION, MOUSEBUTTONDOWN, Surface
 from pygame.draw import rect as draw_rect
 from pygame.event import Event
 from pygame.key import ScancodeWrapper
-from pygame.rect import Rect
-from pygame.transform import scale
 from typing import Callable, Dict, List, Optional
 
 from classes.screen_items.Button import Button
+from classes.screen_items.ParticleSystem import ParticleSystem
 from classes.state_machine.Engine import Engine
-from classes.screens.PlayerSetup import PlayerSetup
 from classes.state_machine.State import State
 from classes.game_components.Table import Table
 from classes.screen_items.TextDisplay import TextDisplay
-from utils.settings import Buttons, Colors, Images, Mains, Paths, Screens, Tables, Fonts
+from utils.cache import scale_cache
+from utils.settings import Animations, Buttons, Colors, Decks, Images, Mains, Paths, Screens, Tables, Fonts
 from utils.support import get_graphics_images_from_folder
-from time import time_ns
-
-@dataclass
-class BackgroundItem:
-    id: int
-    pic: Surface
-    rect: Rect
-    size: int
-    speed: float
 
 
 class MainMenu(State):
+    animating = True
+
     def __init__(self, engine: Engine):
         super().__init__(engine=engine)
 
@@ -43,17 +34,17 @@ class MainMenu(State):
         self.button_2_players: Optional[Button] = None
         self.button_start: Optional[Button] = None
         self.button_quit: Optional[Button] = None
+        self.button_board_size: Optional[Button] = None
         
         self.hover_buttons: list[Button] = []
         self.selection_buttons: list[Button] = []
         self.button_actions: dict[Button, Callable] = None
 
         self.active_button: Optional[Button] = None
+        self.board_size: tuple[int, int] = (Decks.num_rows, Decks.num_columns)
         
         self.animation_images: Optional[list[Surface]] = None
-        self.max_active_animations: int = 55
-        self.active_animation_images: list[BackgroundItem] = []
-        self.animation_started: bool = False
+        self.particles: Optional[ParticleSystem] = None
 
 
         self.init()
@@ -68,37 +59,33 @@ class MainMenu(State):
 
     def create_table(self) -> None:
         table_graphics: list[Surface] | None = get_graphics_images_from_folder(Paths.main_menu_bg())
-        table_texture: Surface = scale(choice(table_graphics), (Tables.texture_size, Tables.texture_size))
+        table_texture: Surface = scale_cache.scale(choice(table_graphics), (Tables.texture_size, Tables.texture_size))
         self.table = Table(table_texture, self.display_surface)
 
     
     def create_bg_animation(self) -> None:
         self.animation_images = get_graphics_images_from_folder(Paths.card_front())
-
-        for i in range(self.max_active_animations):
-            self.create_bg_animation_item()
-
-        self.animation_started = True
+        self.particles = ParticleSystem(
+            self.display_surface, 
+            self.create_bg_animation_sprites(), 
+            Animations.menu_particles, 
+            Images.size_smaller
+        )
 
     
-    def create_bg_animation_item(self) -> None:
-        if len(self.active_animation_images) >= self.max_active_animations: return
-        
+    # Every card image gets one translucent, bordered sprite that all particles showing it share
+    def create_bg_animation_sprites(self) -> list[Surface]:
         image_size = Images.size_smaller
-        start_pos_y = -1 - image_size
         alpha = 128
-        image: Surface = scale(choice(self.animation_images).copy(), (image_size, image_size))
-        image.fill((255, 255, 255, alpha), None, BLEND_RGBA_MULT)
-        x_pos: int = randrange(0, self.display_surface.get_width())
-        y_pos: int = start_pos_y if self.animation_started else randrange(start_pos_y, self.screen_height)
-        item = BackgroundItem(
-            id=int(time_ns() // randint(9, 9999)),
-            pic=image,
-            rect=image.get_rect(center=(x_pos, y_pos)),
-            size=image_size,
-            speed=randint(1,4)
-        )
-        self.active_animation_images.append(item)
+        sprites: list[Surface] = []
+
+        for animation_image in self.animation_images:
+            image: Surface = scale_cache.scale(animation_image, (image_size, image_size))
+            image.fill((255, 255, 255, alpha), None, BLEND_RGBA_MULT)
+            draw_rect(image, Colors.background, image.get_rect(), 1)
+            sprites.append(image)
+
+        return sprites
 
     
     def get_active_button(self) -> Button:
@@ -147,44 +134,46 @@ class MainMenu(State):
         
         self.button_start = Button(3, 'Start', (button_start_pos_x, start_quit_pos_y), Fonts.medium())
 
-        self.hover_buttons = [self.button_quit, self.button_start]
+        board_size_pos_y = headline_pos_y + Fonts.padding_top * Buttons.y_offset_board
+
+        self.button_board_size = Button(5, self.get_board_size_text(), (center, board_size_pos_y), Fonts.medium())
+
+        self.hover_buttons = [self.button_quit, self.button_start, self.button_board_size]
         self.selection_buttons = [self.button_1_player, self.button_2_players]
         self.button_actions = {
             self.button_quit: lambda: self.engine.exit_game(),
-            self.button_start: lambda: setattr(self.engine.machine, 'next_state', PlayerSetup(self.engine, self.active_button.id, self.table))
+            self.button_start: lambda: self.engine.machine.push(
+                Screens.player_info_id, 
+                players_amount=self.active_button.id, 
+                table=self.table, 
+                board_size=self.board_size
+                ),
+            self.button_board_size: lambda: self.change_board_size()
         }
 
-    
-    def handle_bg_animation(self) -> None:
-        if not self.active_animation_images: return
-        
-        for index, item in enumerate(self.active_animation_images):
-            item.rect.y += item.speed    
-            if item.rect.y > self.screen_height + item.size + 1:
-                self.active_animation_images.pop(index)
-                self.create_bg_animation_item()
 
-    
-    def draw_bg_animation(self) -> None:
-        for item in self.active_animation_images:
-            self.display_surface.blit(item.pic, item.rect)
-            draw_rect(item.pic, Colors.background, item.rect, 1)
+    # Cycles through the board sizes listed in Decks.board_sizes
+    def change_board_size(self) -> None:
+        board_sizes = Decks.board_sizes
+        next_index = (board_sizes.index(self.board_size) + 1) % len(board_sizes) if self.board_size in board_sizes else 0
+        self.board_size = board_sizes[next_index]
+        self.button_board_size.text = self.get_board_size_text()
 
 
+    def get_board_size_text(self) -> str:
+        return f'Board {self.board_size[0]}x{self.board_size[1]}'
+
+    
     def update(self) -> None:
-        self.handle_bg_animation()
+        self.particles.update()
 
 
     def draw(self):
          self.table.draw()
-         self.draw_bg_animation()
-         self.headline.draw_static(self.display_surface, Colors.active)
-         self.button_1_player.draw_clickable(self.display_surface, self.get_active_button)
-         self.button_2_players.draw_clickable(self.display_surface, self.get_active_button)
-         self.button_start.draw_hoverable(self.display_surface)
-         self.button_quit.draw_hoverable(self.display_surface)
-
-
-    def run(self):
-        self.update()
-        self.draw()
\ No newline at end of file
+         self.particles.draw(self.interpolation)
+         self.headline.draw_static(Colors.active)
+         self.button_1_player.draw_clickable(self.get_active_button)
+         self.button_2_players.draw_clickable(self.get_active_button)
+         self.button_start.draw_hoverable()
+         self.button_quit.draw_hoverable()
+         self.button_board_size.draw_hoverable()
\ No newline at end of file
@@ -1,9 +1,8 @@
-from pygame import MOUSEBUTTONDOWN, MOUSEMOTION, Surface
+from pygame import MOUSEBUTTONDOWN, MOUSEMOTION, Rect, Surface
 from pygame.event import Event
 from pygame.display import get_surface
 from pygame.key import ScancodeWrapper
 from pygame.sprite import Group
-from pygame.transform import scale
 from random import choice, sample, shuffle
 from typing import List, Optional
 
@@ -17,15 +16,20 @@ from classes.state_machine.State import State
 from classes.game_components.Table import Table
 from classes.screen_items.TextDisplay import TextDisplay
 
-from utils.settings import Buttons, Cards, Colors, Paths, Screens, Tables, Fonts
+from utils.atlas import TextureAtlas
+from utils.cache import scale_cache
+from utils.settings import Buttons, Colors, Decks, Paths, Screens, Tables, Fonts
 from utils.support import get_graphics_images_from_folder
 
 
 class MemoryGame(State):
+    supports_dirty_rects = True
+
     def __init__(
             self, 
             engine: Engine,
             players: list[Player],
+            board_size: tuple[int, int] = (Decks.num_rows, Decks.num_columns),
             ) -> None:
         super().__init__(engine=engine)
 
@@ -37,11 +41,13 @@ class MemoryGame(State):
 
         self.table: Optional[Table] = None
         self.deck: Optional[Deck] = None 
+        self.card_atlas: Optional[TextureAtlas] = None
         self.players: List[Player] = []
 
         self.players = players
         self.players_amount = len(self.players)
-        self.active_player: Player = choice(self.players)
+        self.board_size = board_size
+        self.active_player: Optional[Player] = None
 
         self.button_back: Optional[Button] = None
         self.button_quit: Optional[Button] = None
@@ -58,18 +64,52 @@ class MemoryGame(State):
         self.init()
 
 
+    # A cached game is entered again with the players of the new setup and played from the start
+    def enter(self, players: list[Player], board_size: tuple[int, int] = (Decks.num_rows, Decks.num_columns)) -> None:
+        self.players = players
+        self.players_amount = len(self.players)
+        self.board_size = board_size
+        self.init()
+
+
+    # The screen sized table and the card atlas are the largest surfaces of the game, so they are not kept off the stack
+    def release(self) -> None:
+        self.table = None
+        self.deck = None
+        self.card_atlas = None
+        self.game_over_view = None
+        self.open_cards = []
+        self.players = []
+        self.active_player = None
+
+
     def init(self) -> None:
         self.game_over = False
         self.turns = 0
         self.open_cards = []
         self.player_found_pair = False
         self.game_over_view = None
-        for player in self.players: player.score = 0
+        for player in self.players: player.reset()
         self.active_player: Player = choice(self.players)
 
         self.create_table()
         self.create_deck()
         self.create_screen_items()
+        self.invalidate()
+
+    
+    # Starts a rematch with the same players and board, reusing every surface, sound and widget
+    def reset(self) -> None:
+        self.game_over = False
+        self.turns = 0
+        self.open_cards = []
+        self.player_found_pair = False
+        self.game_over_view.ready = False
+        for player in self.players: player.reset()
+        self.active_player = choice(self.players)
+        self.turn_text.text = f'Turn: {self.turns}'
+        self.deck.shuffle()
+        self.invalidate()
 
     
     def handle_event(self, event: Event, keys: ScancodeWrapper) -> None:
@@ -77,28 +117,35 @@ class MemoryGame(State):
             
             if self.button_back.rect.collidepoint(event.pos) or (self.game_over and self.game_over_view.ready and self.game_over_view.back_button.rect.collidepoint(event.pos)):
                 self.button_back.sound.play()
-                self.engine.machine.next_state = self.engine.machine.previous()
+                self.engine.machine.pop()
             if self.button_quit.rect.collidepoint(event.pos):
                 self.button_quit.sound.play()
                 self.handle_game_over()
 
             if self.game_over and self.game_over_view.ready and self.game_over_view.new_game_button.rect.collidepoint(event.pos):
                 self.game_over_view.new_game_button.sound.play()
-                self.init()
+                self.reset()
+                return
     
             self.handle_player_turn(event)
 
         if event.type == MOUSEMOTION:
-            self.button_back.set_active(self.button_back.rect.collidepoint(event.pos) if self.button_back.rect else False)
-            self.button_quit.set_active(self.button_quit.rect.collidepoint(event.pos) if self.button_quit.rect else False)
+            self.set_button_active(self.button_back, self.button_back.rect.collidepoint(event.pos) if self.button_back.rect else False)
+            self.set_button_active(self.button_quit, self.button_quit.rect.collidepoint(event.pos) if self.button_quit.rect else False)
             if self.game_over and self.game_over_view.ready:
-                self.game_over_view.new_game_button.set_active(self.game_over_view.new_game_button.rect.collidepoint(event.pos))
-                self.game_over_view.back_button.set_active(self.game_over_view.back_button.rect.collidepoint(event.pos))
+                self.set_button_active(self.game_over_view.new_game_button, self.game_over_view.new_game_button.rect.collidepoint(event.pos))
+                self.set_button_active(self.game_over_view.back_button, self.game_over_view.back_button.rect.collidepoint(event.pos))
+
+
+    def set_button_active(self, button: Button, value: bool) -> None:
+        if button.active == value: return
+        button.set_active(value)
+        self.mark_dirty(button.rect)
     
 
     def create_table(self) -> None:
         table_graphics: List[Surface] | None = get_graphics_images_from_folder(Paths.table())
-        table_texture: Surface = scale(choice(table_graphics), (Tables.texture_size, Tables.texture_size))
+        table_texture: Surface = scale_cache.scale(choice(table_graphics), (Tables.texture_size, Tables.texture_size))
         self.table = Table(table_texture, self.display_surface)
 
 
@@ -107,24 +154,52 @@ class MemoryGame(State):
         card_back_graphics: List[Surface] | None = get_graphics_images_from_folder(Paths.card_back())
         card_front_graphics: List[Surface] | None = get_graphics_images_from_folder(Paths.card_front())
         card_back_texture = choice(card_back_graphics)
-        card_front_textures = sample(card_front_graphics, Cards.amount)
-
+        rows, cols = self.board_size
+        pair_amount = rows * cols // 2
+        card_front_textures = sample(card_front_graphics, min(pair_amount, len(card_front_graphics)))
+        card_size = Deck.get_card_size(rows, cols, self.screen_width, self.screen_height)
+
+        # Every card face lives once in the atlas, both cards of a pair and all backs share the same pixels
+        self.card_atlas = TextureAtlas()
+        self.card_atlas.add('back', card_back_texture, (card_size, card_size))
         for index, front_texture in enumerate(card_front_textures):
+            # Both regions of a face are baked from the one scaled texture, the atlas only copies it twice
+            scaled_front: Surface = scale_cache.scale(front_texture, (card_size, card_size))
+            self.card_atlas.add(('front', index), scaled_front)
+            self.card_atlas.add(('found', index), scaled_front)
+        self.card_atlas.build()
+
+        back_img = Card.bake(self.card_atlas.get('back'), Colors.border)
+        faces = [
+            (
+                Card.bake(self.card_atlas.get(('front', index)), Colors.border), 
+                Card.bake(self.card_atlas.get(('found', index)), Colors.active)
+            ) 
+            for index in range(len(card_front_textures))
+        ]
+
+        # Boards with more pairs than images reuse images, any two cards with the same image make a pair
+        for pair_index in range(pair_amount):
+            face_index = pair_index % len(faces)
+            front_img, found_img = faces[face_index]
+            
             created_card = Card(
-                id=(index, 1), 
-                front_img=scale(front_texture, (Cards.size, Cards.size)),
-                back_img=scale(card_back_texture, (Cards.size, Cards.size))
+                id=(face_index, pair_index * 2), 
+                front_img=front_img,
+                back_img=back_img,
+                found_img=found_img
                 )
             created_card_pair = Card(
-                id=(index, 2), 
-                front_img=scale(front_texture, (Cards.size, Cards.size)),
-                back_img=scale(card_back_texture, (Cards.size, Cards.size))
+                id=(face_index, pair_index * 2 + 1), 
+                front_img=front_img,
+                back_img=back_img,
+                found_img=found_img
                 )
             created_cards.append(created_card)
             created_cards.append(created_card_pair)
 
         shuffle(created_cards)
-        self.deck = Deck(self.display_surface, created_cards)
+        self.deck = Deck(self.display_surface, created_cards, rows, cols, card_size)
 
     
     def create_screen_items(self) -> None:
@@ -145,19 +220,24 @@ class MemoryGame(State):
     
     def handle_player_turn(self, event: Event) -> None:
         if self.game_over: return
+
+        changed_cards: List[Card] = self.open_cards.copy()
+        hud_before: List[tuple[object, Rect]] = self.get_hud_views()
         
-        for card in self.deck.cards:
-            if not card.rect.collidepoint(event.pos):
-                continue
-            
-            if not self.handle_card_turn(card):
-                continue
+        card: Optional[Card] = self.deck.card_at(event.pos)
+
+        if card is not None:
+            changed_cards.append(card)
             
-            if not self.player_found_pair and self.players_amount > 1:
+            if self.handle_card_turn(card) and not self.player_found_pair and self.players_amount > 1:
                 self.active_player = next((player for player in self.players if player.id != self.active_player.id))
-            break
 
         self.player_found_pair = False
+        self.turn_text.text = f'Turn: {self.turns}'
+        
+        changed_rects: List[Rect] = [card.rect for card in changed_cards] + self.get_changed_hud_rects(hud_before)
+        for rect in changed_rects: self.mark_dirty(rect)
+        
         self.is_game_over()
 
     
@@ -188,6 +268,28 @@ class MemoryGame(State):
             return True
         
 
+    # What every HUD widget shows, paired with the area it covers
+    def get_hud_views(self) -> List[tuple[object, Rect]]:
+        views: List[tuple[object, Rect]] = [(self.turn_text.text, self.turn_text.get_rect())]
+
+        for player in self.players:
+            active = player.id == self.active_player.id
+            image_rect, name_rect, score_rect = player.get_view_rects()
+            views += [(active, image_rect), (active, name_rect), ((active, player.score_display.text), score_rect)]
+
+        return views
+
+
+    # Areas of the HUD widgets that changed since the given views, covering both their old and new size
+    def get_changed_hud_rects(self, views_before: List[tuple[object, Rect]]) -> List[Rect]:
+        rects: List[Rect] = []
+
+        for (shown_before, rect_before), (shown, rect) in zip(views_before, self.get_hud_views()):
+            if shown_before != shown: rects += [rect_before, rect]
+
+        return rects
+    
+
     def is_game_over(self) -> None:
         for card in self.deck.cards:
             if not card.found_pair: return
@@ -200,6 +302,7 @@ class MemoryGame(State):
         self.game_over_view.players = self.players
         self.game_over_view.turns = self.turns
         self.game_over_view.populate()
+        self.invalidate()
 
 
     def update(self) -> None:
@@ -209,19 +312,14 @@ class MemoryGame(State):
     def draw(self) -> None:
         self.table.draw()
         self.deck.draw(self.screen_width, self.screen_height)
-        self.button_back.draw_hoverable(self.display_surface)
-        self.button_quit.draw_hoverable(self.display_surface)
-        self.turn_text.draw_static(self.display_surface, Colors.active)
+        self.button_back.draw_hoverable()
+        self.button_quit.draw_hoverable()
+        self.turn_text.draw_static(Colors.active)
 
         for player in self.players:
             player_turn = player.id == self.active_player.id
             player.image_display.draw(active=player_turn)
-            player.name_display.draw(display=self.display_surface, active=player_turn)
-            player.score_display.draw(display=self.display_surface, active=player_turn)
-
-        if self.game_over and self.game_over_view.ready: self.game_over_view.draw()
-
+            player.name_display.draw(active=player_turn)
+            player.score_display.draw(active=player_turn)
 
-    def run(self) -> None:
-        self.update()
-        self.draw()
\ No newline at end of file
+        if self.game_over and self.game_over_view.ready: self.game_over_view.draw()
\ No newline at end of file
@@ -2,30 +2,29 @@ from random import choice
 from pygame import K_BACKSPACE, KEYDOWN, MOUSEBUTTONDOWN, TEXTINPUT, MOUSEMOTION, Surface
 from pygame.event import Event
 from pygame.key import ScancodeWrapper
-from pygame.time import get_ticks
-from pygame.transform import scale
 from typing import List, Optional
 
-from classes.screens import MainMenu
 from classes.screen_items.Button import Button
+from classes.screen_items.ImageSelector import ImageSelector
 from classes.state_machine.Engine import Engine
-from classes.screens.MemoryGame import MemoryGame
 from classes.game_components.Player import Player
 from classes.screen_items.PlayerDetailEditor import PlayerDetailEditor
 from classes.state_machine.State import State
 from classes.game_components.Table import Table
+from utils.atlas import TextureAtlas
 from utils.names import NAMES
 from utils.settings import Buttons, Images, Paths, Screens, Fonts
 from utils.support import get_graphics_images_from_folder
 
 
 class PlayerSetup(State):
-    def __init__(self, engine: Engine, players_amount: int, table: Table) -> None:
+    def __init__(self, engine: Engine, players_amount: int, table: Table, board_size: tuple[int, int]) -> None:
         super().__init__(engine)
 
         self.id: int = Screens.player_info_id
         self.players_amount = players_amount
         self.table = table
+        self.board_size = board_size
         
         self.display_surface: Surface = self.engine.screen
         self.screen_width: int = self.display_surface.get_width()
@@ -40,43 +39,60 @@ class PlayerSetup(State):
         self.player_2_editor: Optional[PlayerDetailEditor] = None
 
         self.player_editors: list[PlayerDetailEditor] = []
+        self.avatar_atlas: Optional[TextureAtlas] = None
+        self.thumbnails: list[Surface] = []
+        self.portraits: list[Surface] = []
+        self.image_selector: Optional[ImageSelector] = None
 
         self.active_image_selector: Optional[PlayerDetailEditor] = None
-        self.latest_event: Optional[Event] = None
-        self.last_click_time = 0
-        self.click_cooldown = 200
 
         self.init()
 
 
     def init(self) -> None:
+        self.create_avatar_atlas()
         self.create_screen_items()
 
-    
-    def set_active_image_selector(self, value: PlayerDetailEditor | None) -> None:
-        self.active_image_selector = value
 
+    # The avatar atlas and buttons are kept between visits, only the players are created again
+    def enter(self, players_amount: int, table: Table, board_size: tuple[int, int]) -> None:
+        self.players_amount = players_amount
+        self.table = table
+        self.board_size = board_size
+        self.active_image_selector = None
+        self.create_editors()
+
+
+    def release(self) -> None:
+        self.player_editors = []
+        self.active_image_selector = None
+        self.table = None
 
+    
     def handle_event(self, event: Event, keys: ScancodeWrapper):
-        self.latest_event = event
+        # While the image selector is open clicks only go to it, including the one that closes it
+        selecting_editor: Optional[PlayerDetailEditor] = self.active_image_selector
+
+        if selecting_editor:
+            selecting_editor.handle_image_selection(event)
+            if not selecting_editor.image_selector_active: self.active_image_selector = None
 
         if event.type == MOUSEMOTION:
             self.button_back.active = self.button_back.rect.collidepoint(event.pos) if self.button_back.rect else False
             self.button_start_game.active = self.button_start_game.rect.collidepoint(event.pos) if self.button_start_game.rect else False
         
-        if event.type == MOUSEBUTTONDOWN and not self.active_image_selector:
-            self.last_click_time = get_ticks()
-
+        if event.type == MOUSEBUTTONDOWN and not selecting_editor:
             if self.button_start_game.rect.collidepoint(event.pos):
                 self.button_start_game.sound.play()
-                self.engine.machine.next_state = MemoryGame(
-                    self.engine,
-                    [editor.player for editor in self.player_editors],
+                self.engine.machine.push(
+                    Screens.game_view_id,
+                    players=[editor.player for editor in self.player_editors],
+                    board_size=self.board_size,
                     )
 
             if self.button_back.rect.collidepoint(event.pos):
                 self.button_back.sound.play()
-                self.engine.run(MainMenu.MainMenu(self.engine))
+                self.engine.machine.pop()
 
             for editor in self.player_editors: 
                 editor.image_selector_active = editor.player_img_rect.collidepoint(event.pos)
@@ -106,26 +122,35 @@ class PlayerSetup(State):
         self.create_editors()
 
     
-    def create_editors(self) -> None:
+    # Thumbnails for the image selector and portraits for the players are scaled once into one atlas
+    def create_avatar_atlas(self) -> None:
         player_images: List[Surface] | None = get_graphics_images_from_folder(Paths.card_front())
+
+        self.avatar_atlas = TextureAtlas()
+        for index, image in enumerate(player_images):
+            self.avatar_atlas.add(('thumbnail', index), image, (Images.size_small, Images.size_small))
+            self.avatar_atlas.add(('portrait', index), image, (Images.size_mid, Images.size_mid))
+        self.avatar_atlas.build()
+
+        self.thumbnails = [self.avatar_atlas.get(('thumbnail', index)) for index in range(len(player_images))]
+        self.portraits = [self.avatar_atlas.get(('portrait', index)) for index in range(len(player_images))]
+        self.image_selector = ImageSelector(self.display_surface, self.thumbnails)
+
+    
+    def create_editors(self) -> None:
+        self.player_editors = []
+
         for i in range(self.players_amount):
-            player = Player(i, choice(NAMES), image=scale(choice(player_images), (Images.size_mid, Images.size_mid)))
-            editor = PlayerDetailEditor(self.display_surface, player, player_images, self.players_amount)
+            player = Player(i, choice(NAMES), image=choice(self.portraits))
+            editor = PlayerDetailEditor(self.display_surface, player, self.image_selector, self.portraits, self.players_amount)
             self.player_editors.append(editor)
 
-        print(len(self.player_editors))
-
 
     def draw(self) -> None:
         self.table.draw()
         for editor in self.player_editors: editor.draw_player_details_editor()
-        self.button_start_game.draw_hoverable(self.display_surface)
-        self.button_back.draw_hoverable(self.display_surface)
-        
-        cooldown = get_ticks() - self.last_click_time < self.click_cooldown
-        if self.active_image_selector is not None:
-            self.active_image_selector.draw_image_selector(self.set_active_image_selector, self.latest_event, cooldown)
+        self.button_start_game.draw_hoverable()
+        self.button_back.draw_hoverable()
 
-
-    def run(self) -> None:
-        self.draw()
\ No newline at end of file
+        if self.active_image_selector is not None:
+            self.active_image_selector.draw_image_selector()
\ No newline at end of file
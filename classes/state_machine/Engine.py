@@ -1,61 +1,241 @@
-from typing import List
+from os import environ
+from typing import List, Optional
 from pygame import (
     FULLSCREEN,
+    Rect,
     Surface,
+    KEYDOWN,
+    NOEVENT,
     QUIT,
     quit,
-    K_ESCAPE
+    K_ESCAPE,
+    K_F3
     )
 
-from pygame.display import flip, set_caption, set_mode
+from pygame.display import (
+    flip, 
+    init as init_display, 
+    quit as quit_display, 
+    set_caption, 
+    set_mode, 
+    update as update_display
+    )
     
-from pygame.event import Event, get as get_event
+from pygame.event import Event, get as get_event, wait as wait_event
 from pygame.key import get_pressed, ScancodeWrapper
-from pygame.mixer import init as init_mixer
-from pygame.time import Clock
+from pygame.mixer import init as init_mixer, quit as quit_mixer
+from pygame.time import Clock, get_ticks
 from sys import exit
+from time import perf_counter_ns
 
+from classes.screen_items.FrameStatsOverlay import FrameStatsOverlay
+from classes.state_machine.FrameStats import FrameStats
 from classes.state_machine.Machine import Machine
 from classes.state_machine.State import State
+from utils.render_queue import render_queue
 from utils.settings import Mains, Colors
+from utils.startup_profiler import startup_profiler
 
 
 class Engine:
-    def __init__(self):
-        self.screen: Surface = set_mode((0,0), FULLSCREEN)
+    def __init__(
+            self, 
+            dirty_rendering: bool = Mains.dirty_rendering,
+            headless: bool = False,
+            resolution: Optional[tuple[int, int]] = None
+            ):
+        self.headless: bool = headless
+
+        with startup_profiler.measure('display'):
+            if self.headless:
+                self.__use_dummy_drivers()
+                self.screen: Surface = set_mode(resolution or Mains.virtual_resolution)
+            else:
+                self.screen: Surface = set_mode(resolution or (0, 0), FULLSCREEN)
+            
         self.clock: Clock = Clock()
         self.fps: int = Mains.fps
+        self.dirty_rendering: bool = dirty_rendering
+        self.drawn_state: Optional[State] = None
+        self.framed_state: Optional[State] = None
+        self.stepping: bool = False
+        self.virtual_time_ms: float = 0.0
+        self.simulation_time_ms: Optional[float] = None
+        self.accumulator_ms: float = 0.0
 
-        self.machine = Machine()
+        self.machine = Machine(self)
         self.background_color = Colors.background
+        self.frame_stats = FrameStats()
+        self.frame_stats_overlay = FrameStatsOverlay(self.screen, self.frame_stats)
     
         set_caption(Mains.app_name)
-        init_mixer()
 
+        with startup_profiler.measure('mixer'):
+            init_mixer()
+
+    # While nothing animates the loop sleeps until input arrives and only then draws a frame
     def loop(self):
         while True:
-            self.machine.update()
-            event_list: List[Event] = get_event()
-            keys: ScancodeWrapper = get_pressed()
-            
-            for event in event_list:
-                if event.type == QUIT or keys[K_ESCAPE]:
-                    self.exit_game()
-                else:
-                    self.machine.current_state.handle_event(event=event, keys=keys)
-                    
+            if self.is_idle():
+                event: Event = wait_event(Mains.idle_timeout_ms)
+                event_list: List[Event] = ([] if event.type == NOEVENT else [event]) + get_event()
+                if not event_list and not self.machine.pending: continue
+                # Do not catch up on the simulation steps missed while sleeping
+                self.simulation_time_ms = None
+            else:
+                event_list = get_event()
+
+            self.frame(event_list)
+            self.clock.tick(self.fps)
+
+    def is_idle(self) -> bool:
+        if self.machine.pending or self.frame_stats_overlay.visible: return False
+        if self.machine.current_state is not self.framed_state: return False
+        return not self.machine.current_state.animating
+
+    # Runs frames without a display or sleeping, advancing a virtual clock by one frame each.
+    # Injected events are handled on the first frame together with anything in the event queue.
+    def step(self, frames: int = 1, events: Optional[List[Event]] = None) -> None:
+        self.stepping = True
+        
+        for index in range(frames):
+            injected: List[Event] = list(events or []) if index == 0 else []
+            self.frame(injected + get_event())
+            self.virtual_time_ms += 1000 / self.fps
+
+    # Every phase of the frame is timed and recorded for the state class that ran it
+    def frame(self, event_list: List[Event]) -> None:
+        frame_start = perf_counter_ns()
+        render_queue.reset_counters()
+        self.machine.update()
+        events_start = perf_counter_ns()
+        keys: ScancodeWrapper = get_pressed()
+        
+        for event in event_list:
+            if event.type == QUIT or keys[K_ESCAPE]:
+                self.exit_game()
+            elif event.type == KEYDOWN and event.key == K_F3:
+                self.toggle_frame_stats()
+            else:
+                self.machine.current_state.handle_event(event=event, keys=keys)
+
+        state: State = self.machine.current_state
+        self.framed_state = state
+        update_start = perf_counter_ns()
+        self.simulate(state)
+        draw_start = perf_counter_ns()
+
+        if self.dirty_rendering and state.supports_dirty_rects:
+            update_rects: Optional[List[Rect]] = self.draw_dirty(state)
+        else:
             self.screen.fill(self.background_color)
+            state.draw()
+            render_queue.flush(self.screen)
+            update_rects = None
+        
+        # The overlay is left out of the timed phases, so showing the numbers does not change them
+        draw_end = perf_counter_ns()
+        if self.frame_stats_overlay.visible:
+            self.frame_stats_overlay.draw(type(state).__name__, self.get_ticks())
+            if update_rects is not None: update_rects.append(self.frame_stats_overlay.rect)
+        
+        flip_start = perf_counter_ns()
 
-            self.machine.current_state.run()
-            
+        if update_rects is None:
             flip()
-            self.clock.tick(self.fps)
+        elif update_rects:
+            update_display(update_rects)
+        
+        frame_end = perf_counter_ns()
+        overlay_ns = flip_start - draw_end
+        state_name = type(state).__name__
+        self.frame_stats.record(state_name, 'machine', events_start - frame_start)
+        self.frame_stats.record(state_name, 'events', update_start - events_start)
+        self.frame_stats.record(state_name, 'update', draw_start - update_start)
+        self.frame_stats.record(state_name, 'draw', draw_end - draw_start)
+        self.frame_stats.record(state_name, 'flip', frame_end - flip_start)
+        self.frame_stats.record(state_name, 'frame', frame_end - frame_start - overlay_ns)
+
+    def toggle_frame_stats(self) -> None:
+        self.frame_stats_overlay.toggle()
+        self.machine.current_state.invalidate()
+
+    # Runs as many fixed simulation steps as time has advanced, so gameplay speed does not depend on frame rate.
+    # The remainder is left for the next frame and exposed to drawing as the state's interpolation.
+    # Stepped frames always advance exactly one frame of virtual time.
+    def simulate(self, state: State) -> None:
+        step_ms = 1000 / Mains.simulation_rate
+
+        if self.stepping:
+            elapsed_ms = 1000 / self.fps
+        else:
+            now_ms = perf_counter_ns() / 1_000_000
+            elapsed_ms = 0.0 if self.simulation_time_ms is None else now_ms - self.simulation_time_ms
+            self.simulation_time_ms = now_ms
+        
+        self.accumulator_ms += min(elapsed_ms, Mains.max_frame_time_ms)
+
+        while self.accumulator_ms >= step_ms:
+            state.update()
+            self.accumulator_ms -= step_ms
+
+        state.interpolation = self.accumulator_ms / step_ms
+
+    # Milliseconds since startup, taken from the virtual clock once the engine is stepped manually
+    def get_ticks(self) -> int:
+        return int(self.virtual_time_ms) if self.stepping else get_ticks()
+
+    # Redraws only the regions the state reported as changed, clipping the state's draw to each of them.
+    # Returns the regions to update on the display, or None when the whole screen was redrawn.
+    def draw_dirty(self, state: State) -> Optional[List[Rect]]:
+        if state is not self.drawn_state:
+            state.invalidate()
+            self.drawn_state = state
+
+        if state.full_redraw:
+            state.full_redraw = False
+            state.dirty_rects.clear()
+            self.screen.fill(self.background_color)
+            state.draw()
+            render_queue.flush(self.screen)
+            return None
+        
+        if not state.dirty_rects: return []
+
+        screen_rect: Rect = self.screen.get_rect()
+        dirty_rects: List[Rect] = [rect.clip(screen_rect) for rect in state.dirty_rects]
+        state.dirty_rects.clear()
+
+        if len(dirty_rects) > Mains.max_dirty_rects:
+            dirty_rects = [dirty_rects[0].unionall(dirty_rects[1:])]
+
+        # The state draws once and the same commands are replayed clipped to each region
+        state.draw()
+
+        for rect in dirty_rects:
+            self.screen.set_clip(rect)
+            self.screen.fill(self.background_color, rect)
+            render_queue.flush(self.screen, keep=True)
+
+        render_queue.clear()
+        self.screen.set_clip(None)
+        return dirty_rects
 
     def exit_game(self) -> None:
         quit()
         exit()
 
+    def start(self, state: State) -> None:
+        self.machine.start(state)
+
     def run(self, state: State) -> None:
-        self.machine.current_state = state
+        self.start(state)
         self.loop()
-    
\ No newline at end of file
+
+    # SDL reads the driver variables when its subsystems start, so restart them if pygame is already initialized
+    def __use_dummy_drivers(self) -> None:
+        environ['SDL_VIDEODRIVER'] = 'dummy'
+        environ['SDL_AUDIODRIVER'] = 'dummy'
+        quit_display()
+        init_display()
+        quit_mixer()
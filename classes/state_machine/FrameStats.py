@@ -0,0 +1,41 @@
+from collections import deque
+from statistics import quantiles
+
+from utils.settings import Profiling
+
+
+# Keeps the durations of the latest frames per state class and frame phase
+class FrameStats:
+    def __init__(self, window_frames: int = Profiling.window_frames) -> None:
+        self.window_frames = window_frames
+        self.samples: dict[str, dict[str, deque[int]]] = {}
+
+
+    def record(self, state_name: str, phase: str, duration_ns: int) -> None:
+        phases = self.samples.get(state_name)
+
+        if phases is None:
+            phases = {name: deque(maxlen=self.window_frames) for name in Profiling.phases}
+            self.samples[state_name] = phases
+
+        phases[phase].append(duration_ns)
+
+
+    # Returns p50, p95 and p99 in milliseconds
+    def percentiles(self, state_name: str, phase: str) -> tuple[float, float, float]:
+        samples = self.samples.get(state_name, {}).get(phase)
+        if not samples: return (0.0, 0.0, 0.0)
+        if len(samples) == 1: return (samples[0] / 1_000_000,) * 3
+
+        cuts = quantiles(samples, n=100, method='inclusive')
+        return (cuts[49] / 1_000_000, cuts[94] / 1_000_000, cuts[98] / 1_000_000)
+    
+
+    def report(self) -> dict[str, dict[str, dict[str, float]]]:
+        return {
+            state_name: {
+                phase: dict(zip(('p50_ms', 'p95_ms', 'p99_ms'), self.percentiles(state_name, phase)))
+                for phase in phases
+            }
+            for state_name, phases in self.samples.items()
+        }
@@ -1,19 +1,101 @@
+from importlib import import_module
+from typing import Callable, Optional
+
 from classes.state_machine.State import State
+from utils.fonts import font_cache
+from utils.settings import Screens
 
 
+# Keeps the states on a stack, the topmost one being the current state.
+# Every state id has at most one instance, which is reused with enter each time the state is entered again.
+# States leaving the stack are released, so memory stays flat however many times the screens are visited.
 class Machine:
-    def __init__(self):
-        self.current_state: State = None
-        self.previous_state: State = None
-        self.next_state: State = None
+    # Module of each state by id, named after the state class it holds.
+    # States are imported on first entry, so startup only loads the modules of the first screen.
+    states: dict[int, str] = {
+        Screens.main_menu_id: 'classes.screens.MainMenu',
+        Screens.player_info_id: 'classes.screens.PlayerSetup',
+        Screens.game_view_id: 'classes.screens.MemoryGame',
+        Screens.loading_id: 'classes.screens.Loading',
+    }
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.stack: list[State] = []
+        self.instances: dict[int, State] = {}
+        # Transitions requested while handling a frame are applied at the start of the next one
+        self.pending: Optional[Callable[[], None]] = None
+
+
+    @property
+    def current_state(self) -> Optional[State]:
+        return self.stack[-1] if self.stack else None
+
 
     def update(self):
-        if self.next_state:
-            self.previous_state = self.current_state
-            self.current_state = self.next_state
-            self.next_state = None
-
-    
-    def previous(self) -> None:
-        self.current_state = self.previous_state
-        self.previous_state = None
\ No newline at end of file
+        if self.pending:
+            transition, self.pending = self.pending, None
+            transition()
+            self.current_state.invalidate()
+            font_cache.set_scope(type(self.current_state).__name__)
+
+
+    def push(self, state_id: int, **kwargs) -> None:
+        self.pending = lambda: self.__push(state_id, kwargs)
+
+
+    def pop(self) -> None:
+        self.pending = self.__pop
+
+
+    def replace(self, state_id: int, **kwargs) -> None:
+        self.pending = lambda: self.__replace(state_id, kwargs)
+
+
+    # Makes the given state the only one on the stack right away, releasing the states it replaces
+    def start(self, state: State) -> None:
+        while self.stack: self.stack.pop().release()
+        self.instances[state.id] = state
+        self.stack.append(state)
+        font_cache.set_scope(type(state).__name__)
+
+
+    def get_state_class(self, state_id: int) -> type[State]:
+        module_path: str = self.states[state_id]
+        return getattr(import_module(module_path), module_path.rsplit('.', 1)[-1])
+
+
+    def create(self, state_id: int, **kwargs) -> State:
+        return self.get_state_class(state_id)(engine=self.engine, **kwargs)
+
+
+    # Returns the cached instance of the state entered with the given parameters, building it on first use
+    def get(self, state_id: int, **kwargs) -> State:
+        state: Optional[State] = self.instances.get(state_id)
+
+        if state is None:
+            state = self.instances[state_id] = self.create(state_id, **kwargs)
+        else:
+            state.enter(**kwargs)
+
+        return state
+
+
+    # A state already on the stack is returned to, releasing the states above it
+    def __push(self, state_id: int, kwargs: dict) -> None:
+        state: Optional[State] = self.instances.get(state_id)
+
+        if state in self.stack:
+            while self.stack[-1] is not state: self.stack.pop().release()
+            self.stack.pop()
+
+        self.stack.append(self.get(state_id, **kwargs))
+
+
+    def __pop(self) -> None:
+        if len(self.stack) > 1: self.stack.pop().release()
+
+
+    def __replace(self, state_id: int, kwargs: dict) -> None:
+        if self.stack: self.stack.pop().release()
+        self.__push(state_id, kwargs)
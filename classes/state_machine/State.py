@@ -1,11 +1,36 @@
+from pygame import Rect
 from pygame.event import Event
 from pygame.key import (
     ScancodeWrapper
     )
 
+from utils.fonts import font_cache
+
 class State():
+    # States that report their changed regions can opt in to the engine's dirty rectangle rendering
+    supports_dirty_rects: bool = False
+    # States that change without input keep the engine running at full frame rate
+    animating: bool = False
+
     def __init__(self, engine) -> None:
         self.engine = engine
+        self.full_redraw: bool = True
+        self.dirty_rects: list[Rect] = []
+        # How far rendering is between the last two simulation steps, from 0 to 1
+        self.interpolation: float = 1.0
+        font_cache.set_scope(type(self).__name__)
     
-    def run(self): pass
-    def handle_event(self, event: Event, keys: ScancodeWrapper): pass 
\ No newline at end of file
+    # Advances the simulation by one fixed step of 1 / Mains.simulation_rate seconds
+    def update(self): pass
+    def draw(self): pass
+    def handle_event(self, event: Event, keys: ScancodeWrapper): pass 
+    # Called with the state's parameters when the machine enters its cached instance again
+    def enter(self, **kwargs): pass
+    # Frees what the state only needs while on the stack, it is always entered again before the next draw
+    def release(self): pass
+
+    def mark_dirty(self, rect: Rect | None) -> None:
+        if rect: self.dirty_rects.append(Rect(rect))
+
+    def invalidate(self) -> None:
+        self.full_redraw = True
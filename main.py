@@ -1,13 +1,50 @@
-from pygame import init as init_game
-from classes.state_machine.Engine import Engine
-from classes.screens.MainMenu import MainMenu
+from argparse import ArgumentParser
+
+from utils.startup_profiler import startup_profiler
 
 
 def main() -> None:
-    init_game()
+    parser = ArgumentParser(description='Memory game')
+    parser.add_argument('--profile-startup', action='store_true', help='Report import and initialization times until the main menu is shown')
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        startup_profiler.enable()
+
+    # Imported here so the profiler, when enabled, sees every module the game loads
+    with startup_profiler.measure('imports'):
+        from pygame.display import init as init_display
+        from pygame.font import init as init_font
+        from pygame.event import get as get_event
+        from classes.state_machine.Engine import Engine
+        from utils.settings import Fonts, Screens
+
+    # Subsystems are started one by one rather than with pygame.init, the engine starts the mixer in its own step
+    with startup_profiler.measure('pygame init'):
+        init_display()
+        init_font()
+
     engine = Engine()
-    engine.run(MainMenu(engine=engine))
+
+    with startup_profiler.measure('fonts'):
+        Fonts.large()
+        Fonts.medium()
+        Fonts.small()
+
+    with startup_profiler.measure('first state'):
+        engine.start(engine.machine.create(Screens.loading_id, next_state_id=Screens.main_menu_id))
+
+    if args.profile_startup:
+        with startup_profiler.measure('assets and main menu'):
+            while engine.machine.current_state.id != Screens.main_menu_id:
+                engine.frame(get_event())
+                engine.clock.tick(engine.fps)
+
+        print(startup_profiler.report())
+        startup_profiler.disable()
+
+    engine.loop()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,55 @@
+from typing import Hashable, Optional
+from pygame import SRCALPHA, Rect, Surface
+
+from utils.cache import scale_cache
+from utils.settings import Atlases
+
+
+# Packs textures, scaled to the sizes they are drawn at, into one surface and hands out subsurfaces of it.
+# Add every texture first, then build the atlas once before getting any of them.
+class TextureAtlas:
+    def __init__(self, max_width: int = Atlases.max_width) -> None:
+        self.max_width = max_width
+        self.pending: dict[Hashable, tuple[Surface, tuple[int, int]]] = {}
+        self.regions: dict[Hashable, Rect] = {}
+        self.images: dict[Hashable, Surface] = {}
+        self.surface: Optional[Surface] = None
+
+
+    def add(self, key: Hashable, image: Surface, size: Optional[tuple[int, int]] = None) -> None:
+        if key in self.pending: return
+        self.pending[key] = (image, size or image.get_size())
+
+
+    # Shelf packing: tallest textures first, left to right, starting a new row when the width runs out
+    def build(self) -> None:
+        padding = Atlases.padding
+        entries = sorted(self.pending.items(), key=lambda entry: entry[1][1][1], reverse=True)
+        x, y, shelf_height, atlas_width = 0, 0, 0, 0
+
+        for key, (_, (width, height)) in entries:
+            if x and x + width > self.max_width:
+                x, y, shelf_height = 0, y + shelf_height + padding, 0
+
+            self.regions[key] = Rect(x, y, width, height)
+            x += width + padding
+            shelf_height = max(shelf_height, height)
+            atlas_width = max(atlas_width, x - padding)
+
+        self.surface = Surface((max(atlas_width, 1), max(y + shelf_height, 1)), SRCALPHA).convert_alpha()
+
+        for key, (image, size) in entries:
+            region = self.regions[key]
+            self.surface.blit(image if image.get_size() == size else scale_cache.scale(image, size), region)
+            self.images[key] = self.surface.subsurface(region)
+
+        scale_cache.save()
+        self.pending.clear()
+
+
+    def get(self, key: Hashable) -> Surface:
+        return self.images[key]
+    
+
+    def get_bytes(self) -> int:
+        return self.surface.get_pitch() * self.surface.get_height() if self.surface else 0
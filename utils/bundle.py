@@ -0,0 +1,176 @@
+from json import dumps, loads
+from mmap import ACCESS_COPY, mmap
+from os import stat
+from os.path import exists
+from struct import calcsize, error as StructError, pack, unpack_from
+from typing import Optional
+from pygame import Surface
+from pygame.image import frombuffer, load as load_image, tobytes
+
+from utils.settings import Bundles, Paths
+
+
+HEADER_FORMAT = '<8sI'
+
+
+# Reads images and sounds from one file packed by write_bundle, without decoding or walking folders.
+# The file starts with a magic string, the length of a JSON index and the index itself.
+# Images are stored as raw RGBA pixels and sounds as the bytes of their files, each at an aligned offset.
+# Images are keyed by the same paths the image cache uses, sounds by their name in Sounds.
+# The index also keeps the size and modification time of every packed file and image folder.
+# A bundle whose sources have changed since it was packed, or that cannot be read, is ignored and the folders are used.
+class AssetBundle:
+    def __init__(self, path: str = Bundles.path) -> None:
+        self.path = path
+        self.buffer: Optional[mmap] = None
+        self.data_offset: int = 0
+        self.images: dict[str, tuple[int, int, int, int]] = {}
+        self.sounds: dict[str, tuple[int, int]] = {}
+        self.folders: dict[str, list[str]] = {}
+        self.opened: bool = False
+
+
+    # Maps the bundle on first use, returns False when no bundle has been built or it cannot be used
+    def open(self) -> bool:
+        if self.opened: return self.buffer is not None
+        self.opened = True
+
+        if not exists(self.path): return False
+
+        try:
+            with open(self.path, 'rb') as file:
+                # A private mapping lets surfaces share the pages without anything being written back to the file
+                self.buffer = mmap(file.fileno(), 0, access=ACCESS_COPY)
+
+            magic, index_length = unpack_from(HEADER_FORMAT, self.buffer)
+            if magic != Bundles.magic: return self.__reject('is not an asset bundle')
+
+            index_start = calcsize(HEADER_FORMAT)
+            index: dict = loads(self.buffer[index_start:index_start + index_length])
+            data_offset = get_aligned(index_start + index_length)
+            images = {key: tuple(entry) for key, entry in index['images'].items()}
+            sounds = {key: tuple(entry) for key, entry in index['sounds'].items()}
+            sources: dict[str, list[int]] = index['sources']
+        except (OSError, ValueError, KeyError, StructError) as error:
+            return self.__reject(f'could not be read ({type(error).__name__}: {error})')
+
+        data_end = max((offset + size for offset, size, *_ in (*images.values(), *sounds.values())), default=0)
+        if data_offset + data_end > len(self.buffer): return self.__reject('is truncated')
+
+        if any(get_source_stamp(source_path) != stamp for source_path, stamp in sources.items()):
+            return self.__reject('was packed from assets that have changed since')
+
+        self.data_offset = data_offset
+        self.images = images
+        self.sounds = sounds
+
+        for key in self.images:
+            self.folders.setdefault(key.rsplit('/', 1)[0], []).append(key)
+
+        return True
+
+
+    def has_image(self, key: str) -> bool:
+        return self.open() and key in self.images
+
+
+    def has_sound(self, name: str) -> bool:
+        return self.open() and name in self.sounds
+
+
+    # Surface over the mapped pixels, convert it before drawing on it or keeping it
+    def get_image(self, key: str) -> Surface:
+        _, _, width, height = self.images[key]
+        return frombuffer(self.get_pixels(key), (width, height), 'RGBA')
+
+
+    # Raw RGBA pixels of an image, read straight from the mapping
+    def get_pixels(self, key: str) -> memoryview:
+        offset, size, _, _ = self.images[key]
+        start = self.data_offset + offset
+        return memoryview(self.buffer)[start:start + size]
+
+
+    def get_sound(self, name: str) -> memoryview:
+        offset, size = self.sounds[name]
+        start = self.data_offset + offset
+        return memoryview(self.buffer)[start:start + size]
+
+
+    def __reject(self, reason: str) -> bool:
+        print(f'[Exception]::[{self.path} {reason}, loading assets from their folders]')
+        if self.buffer is not None: self.buffer.close()
+        self.buffer = None
+        return False
+
+
+    # Keys of the images packed from a folder in the order they were found in it, or None for unknown folders
+    def get_folder(self, folder_path: str) -> Optional[list[str]]:
+        if not self.open(): return None
+        return self.folders.get(folder_path)
+
+
+def get_aligned(offset: int) -> int:
+    return -(-offset // Bundles.alignment) * Bundles.alignment
+
+
+# Size and modification time of a file or folder, None when it no longer exists
+def get_source_stamp(path: str) -> Optional[list[int]]:
+    try:
+        source = stat(path)
+    except OSError:
+        return None
+    return [source.st_size, source.st_mtime_ns]
+
+
+def write_bundle(image_paths: list[str], sound_names: list[str], path: str = Bundles.path) -> int:
+    index: dict[str, dict] = {'images': {}, 'sounds': {}, 'sources': {}}
+    blobs: list[bytes] = []
+    offset = 0
+
+    def add_blob(blob: bytes) -> int:
+        nonlocal offset
+        blob_offset = offset
+        padding = get_aligned(len(blob)) - len(blob)
+        blobs.append(blob + bytes(padding))
+        offset += len(blob) + padding
+        return blob_offset
+
+    for image_path in image_paths:
+        image: Surface = load_image(image_path)
+        pixels: bytes = tobytes(image, 'RGBA')
+        index['images'][image_path] = [add_blob(pixels), len(pixels), image.get_width(), image.get_height()]
+        index['sources'][image_path] = get_source_stamp(image_path)
+        # Folders are stamped too, so images added to or removed from them are noticed
+        folder_path = image_path.rsplit('/', 1)[0]
+        index['sources'][folder_path] = get_source_stamp(folder_path)
+
+    for name in sound_names:
+        with open(Paths.sound(name), 'rb') as file:
+            sound_bytes = file.read()
+        index['sounds'][name] = [add_blob(sound_bytes), len(sound_bytes)]
+        index['sources'][Paths.sound(name)] = get_source_stamp(Paths.sound(name))
+
+    index_bytes = dumps(index).encode()
+    header = pack(HEADER_FORMAT, Bundles.magic, len(index_bytes)) + index_bytes
+    header += bytes(get_aligned(len(header)) - len(header))
+
+    with open(path, 'wb') as file:
+        file.write(header)
+        for blob in blobs: file.write(blob)
+
+    return len(header) + offset
+
+
+asset_bundle = AssetBundle()
+
+
+if __name__ == '__main__':
+    from dataclasses import fields
+    from utils.settings import Sounds
+    from utils.support import get_image_paths
+
+    image_paths = get_image_paths(Paths.graphics_path)
+    sound_names = [getattr(Sounds, field.name) for field in fields(Sounds)]
+    bundle_bytes = write_bundle(image_paths, sound_names)
+    print(f'Packed {len(image_paths)} images and {len(sound_names)} sounds into {Bundles.path} ({bundle_bytes / 1_000_000:.1f} MB)')
@@ -0,0 +1,330 @@
+from atexit import register as register_exit
+from collections import OrderedDict
+from dataclasses import fields
+from hashlib import sha1
+from io import BytesIO
+from json import dumps, loads
+from os import makedirs, replace, stat
+from os.path import join
+from pygame import Surface
+from pygame.draw import rect as draw_rect
+from pygame.font import Font
+from pygame.image import frombytes, load as load_image, tobytes
+from pygame.mixer import Sound, get_init as get_mixer_init
+from pygame.transform import scale, smoothscale
+from time import perf_counter_ns
+from typing import Optional
+
+from utils.bundle import asset_bundle
+from utils.settings import Caches, Paths, Sounds
+
+
+# Process-wide registry of decoded images keyed by file path.
+# Surfaces are shared between callers, so copy or scale them before drawing on them.
+# Images packed into the asset bundle are read from it instead of being decoded from their files.
+class ImageCache:
+    def __init__(self, budget_bytes: int = Caches.image_budget_bytes) -> None:
+        self.budget_bytes = budget_bytes
+        self.images: OrderedDict[str, Surface] = OrderedDict()
+        # Source path of every cached surface by its id, for caches keyed by file contents
+        self.paths: dict[int, str] = {}
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+
+    def get(self, path: str) -> Surface:
+        image = self.images.get(path)
+
+        if image is not None:
+            self.hits += 1
+            self.images.move_to_end(path)
+            return image
+        
+        self.misses += 1
+        source: Surface = asset_bundle.get_image(path) if asset_bundle.has_image(path) else load_image(path)
+        image = source.convert_alpha()
+        self.put(path, image)
+        return image
+    
+
+    def put(self, path: str, image: Surface) -> None:
+        if path in self.images:
+            self.__remove(self.images.pop(path))
+
+        self.images[path] = image
+        self.paths[id(image)] = path
+        self.bytes += self.__get_size(image)
+        self.__evict()
+
+
+    # File the surface was loaded from, or None when it did not come from the cache
+    def get_path(self, image: Surface) -> Optional[str]:
+        return self.paths.get(id(image))
+
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self.__evict()
+
+
+    def clear(self) -> None:
+        self.images.clear()
+        self.paths.clear()
+        self.bytes = 0
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'images': len(self.images),
+            'bytes': self.bytes,
+            'budget_bytes': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+    
+
+    # The most recently used image is always kept, even if it alone exceeds the budget
+    def __evict(self) -> None:
+        while self.bytes > self.budget_bytes and len(self.images) > 1:
+            _, image = self.images.popitem(last=False)
+            self.__remove(image)
+            self.evictions += 1
+
+
+    def __remove(self, image: Surface) -> None:
+        self.paths.pop(id(image), None)
+        self.bytes -= self.__get_size(image)
+
+
+    def __get_size(self, image: Surface) -> int:
+        return image.get_pitch() * image.get_height()
+
+
+# Loads every entry of Sounds once and shares the decoded buffers between all cards and buttons.
+# Requires the mixer to be initialized, which the Engine does on startup.
+class SoundBank:
+    def __init__(self) -> None:
+        self.sounds: dict[str, Sound] = {}
+        self.load_time_ns: int = 0
+        self.bytes: int = 0
+
+
+    def get(self, name: str) -> Sound:
+        sound = self.sounds.get(name)
+
+        if sound is None:
+            sound = self.__load(name)
+
+        return sound
+    
+
+    def put(self, name: str, sound: Sound) -> None:
+        if name in self.sounds:
+            self.bytes -= self.__get_size(self.sounds[name])
+
+        self.sounds[name] = sound
+        self.bytes += self.__get_size(sound)
+
+
+    def load_all(self) -> None:
+        for field in fields(Sounds):
+            self.get(getattr(Sounds, field.name))
+
+
+    def clear(self) -> None:
+        self.sounds.clear()
+        self.bytes = 0
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'sounds': len(self.sounds),
+            'bytes': self.bytes,
+            'load_time_ms': self.load_time_ns // 1_000_000,
+        }
+
+
+    def __load(self, name: str) -> Sound:
+        start = perf_counter_ns()
+        sound = Sound(file=BytesIO(asset_bundle.get_sound(name))) if asset_bundle.has_sound(name) else Sound(Paths.sound(name))
+        self.load_time_ns += perf_counter_ns() - start
+        self.put(name, sound)
+        return sound
+
+
+    # Size of the decoded samples in the mixer's format, without copying them out like get_raw does
+    def __get_size(self, sound: Sound) -> int:
+        mixer_format = get_mixer_init()
+        if not mixer_format: return 0
+
+        frequency, sample_bits, channels = mixer_format
+        return round(sound.get_length() * frequency) * channels * (abs(sample_bits) // 8)
+
+
+# Keeps the most recently rendered text surfaces so widgets do not rasterize the same text every frame.
+# Surfaces are shared, so never draw on a surface returned by render.
+class TextCache:
+    def __init__(self, max_size: int = Caches.text_cache_size) -> None:
+        self.max_size = max_size
+        self.surfaces: OrderedDict[tuple, Surface] = OrderedDict()
+        self.hits: int = 0
+        self.renders: int = 0
+
+
+    def render(
+            self,
+            font: Font,
+            text: str,
+            color: str | tuple[int, int, int],
+            antialias: bool = True,
+            background: str | tuple[int, int, int] | None = None,
+            border_width: int = 0
+            ) -> Surface:
+        key = (font, text, color, antialias, background, border_width)
+        surface = self.surfaces.get(key)
+
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.renders += 1
+        surface = font.render(text, antialias, color, background)
+
+        if border_width:
+            draw_rect(surface, color, surface.get_rect(), border_width)
+
+        self.surfaces[key] = surface
+        
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+
+        return surface
+    
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'surfaces': len(self.surfaces),
+            'hits': self.hits,
+            'renders': self.renders,
+        }
+
+
+# Keeps smoothscaled copies of cached images on disk, keyed by the content hash of the source file and the target size.
+# A changed source file hashes differently, so its old variants are simply never read again.
+# Hashes are remembered by file size and modification time, so unchanged files are not read again on later runs.
+# Images read from the asset bundle are keyed by a hash of their bundled pixels instead, as those are what gets scaled.
+# The remembered hashes are saved once per batch of scaling with save, and at exit.
+# Plain scale is cheaper than reading a variant back, so without smoothscale images are always scaled in memory.
+class ScaleCache:
+    def __init__(self, folder: str = Caches.scaled_images_path, smooth: bool = Caches.smoothscale) -> None:
+        self.folder = folder
+        self.smooth = smooth
+        self.hashes: Optional[dict[str, list]] = None
+        # Digests already checked against their files during this run
+        self.digests: dict[str, str] = {}
+        self.hashes_changed: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+        register_exit(self.save)
+
+
+    # Returns a new surface the caller owns, images that did not come from a file are scaled in memory
+    def scale(self, image: Surface, size: tuple[int, int]) -> Surface:
+        if not self.smooth: return scale(image, size)
+
+        path: Optional[str] = image_cache.get_path(image)
+        digest: Optional[str] = self.__get_hash(path) if path else None
+        if digest is None: return smoothscale(image, size)
+
+        variant_path = join(self.folder, f'{digest}_{size[0]}x{size[1]}.rgba')
+
+        try:
+            with open(variant_path, 'rb') as file:
+                scaled_bytes = file.read()
+            self.hits += 1
+            return frombytes(scaled_bytes, size, 'RGBA').convert_alpha()
+        except (OSError, ValueError):
+            self.misses += 1
+
+        scaled: Surface = smoothscale(image, size)
+        self.__write(variant_path, tobytes(scaled, 'RGBA'))
+        return scaled
+
+
+    # Writes the hashes of newly read files to the index, if there are any
+    def save(self) -> None:
+        if not self.hashes_changed: return
+
+        self.__write(join(self.folder, 'index.json'), dumps(self.hashes).encode())
+        self.hashes_changed = False
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+    # Content hash of the pixels the image was made from, or None when there is nothing to key the variants by
+    def __get_hash(self, path: str) -> Optional[str]:
+        if path in self.digests: return self.digests[path]
+
+        if asset_bundle.has_image(path):
+            digest: str = sha1(asset_bundle.get_pixels(path)).hexdigest()
+            self.digests[path] = digest
+            return digest
+
+        if self.hashes is None: self.hashes = self.__read_index()
+
+        try:
+            file_stat = stat(path)
+        except OSError:
+            return None
+
+        entry: Optional[list] = self.hashes.get(path)
+
+        if entry and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+            digest = entry[2]
+        else:
+            with open(path, 'rb') as file:
+                digest = sha1(file.read()).hexdigest()
+            self.hashes[path] = [file_stat.st_size, file_stat.st_mtime_ns, digest]
+            self.hashes_changed = True
+
+        self.digests[path] = digest
+        return digest
+
+
+    def __read_index(self) -> dict[str, list]:
+        try:
+            with open(join(self.folder, 'index.json'), 'rb') as file:
+                return loads(file.read())
+        except (OSError, ValueError):
+            return {}
+
+
+    # Writes through a temporary file, so an interrupted run never leaves a truncated variant behind
+    def __write(self, path: str, data: bytes) -> None:
+        try:
+            makedirs(self.folder, exist_ok=True)
+            temporary_path = f'{path}.tmp'
+            with open(temporary_path, 'wb') as file:
+                file.write(data)
+            replace(temporary_path, path)
+        except OSError as error:
+            print(f'[Exception]::[{type(error).__name__} occured while writing {path}: {error}]')
+
+
+image_cache = ImageCache()
+sound_bank = SoundBank()
+text_cache = TextCache()
+scale_cache = ScaleCache()
@@ -0,0 +1,47 @@
+from pygame.font import Font
+
+
+# Parses every (file, size) font face once per process.
+# Opens are counted per scope, which the state machine sets to the name of the state being built or run.
+class FontCache:
+    def __init__(self) -> None:
+        self.fonts: dict[tuple[str, int], Font] = {}
+        self.scope: str = 'startup'
+        self.hits: int = 0
+        self.opens: int = 0
+        self.opens_by_scope: dict[str, int] = {}
+
+
+    def get(self, file: str, size: int) -> Font:
+        key = (file, size)
+        font = self.fonts.get(key)
+
+        if font is not None:
+            self.hits += 1
+            return font
+        
+        font = Font(file, size)
+        self.fonts[key] = font
+        self.opens += 1
+        self.opens_by_scope[self.scope] = self.opens_by_scope.get(self.scope, 0) + 1
+        return font
+    
+
+    def set_scope(self, scope: str) -> None:
+        self.scope = scope
+
+
+    def clear(self) -> None:
+        self.fonts.clear()
+
+
+    def stats(self) -> dict:
+        return {
+            'fonts': len(self.fonts),
+            'hits': self.hits,
+            'opens': self.opens,
+            'opens_by_scope': dict(self.opens_by_scope),
+        }
+
+
+font_cache = FontCache()
@@ -0,0 +1,112 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import fields
+from pygame import Surface
+from pygame.image import load as load_image
+from pygame.mixer import Sound
+from time import perf_counter_ns
+from typing import Optional
+
+from utils.bundle import asset_bundle
+from utils.cache import image_cache, sound_bank
+from utils.settings import Paths, Preloads, Sounds
+from utils.support import get_image_paths
+
+
+# Decodes every image and sound under the data folders on a thread pool, as pygame releases the GIL while decoding.
+# Converting to the display format is not thread safe, so poll hands finished images to image_cache on the calling thread.
+# Images are stored under the same paths get_graphics_images_from_folder looks them up with.
+# When an asset bundle has been built nothing needs decoding, so its images are only converted as poll goes.
+class Preloader:
+    def __init__(self, workers: int = Preloads.workers) -> None:
+        self.workers = workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.image_futures: list[Future] = []
+        self.sound_futures: list[Future] = []
+        self.bundled_paths: list[str] = []
+        self.total: int = 0
+        self.loaded: int = 0
+        self.start_ns: int = 0
+        self.load_time_ns: int = 0
+
+
+    def start(self) -> None:
+        self.start_ns = perf_counter_ns()
+        sound_names: list[str] = [getattr(Sounds, field.name) for field in fields(Sounds)]
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='preload')
+
+        if asset_bundle.open():
+            self.bundled_paths = list(asset_bundle.images)
+        else:
+            self.image_futures = [self.executor.submit(self.__decode_image, path) for path in get_image_paths(Paths.graphics_path)]
+
+        self.sound_futures = [
+            self.executor.submit(self.__decode_sound, name)
+            for name in sound_names if not asset_bundle.has_sound(name)
+        ]
+        for name in filter(asset_bundle.has_sound, sound_names): sound_bank.get(name)
+
+        self.total = len(self.bundled_paths) + len(self.image_futures) + len(self.sound_futures)
+
+
+    # Stores finished assets until the time budget runs out and returns True once everything is loaded
+    def poll(self, budget_ms: float = Preloads.poll_budget_ms) -> bool:
+        deadline = perf_counter_ns() + budget_ms * 1_000_000
+
+        for future in [future for future in self.sound_futures if future.done()]:
+            name, sound, decode_ns = future.result()
+            sound_bank.put(name, sound)
+            sound_bank.load_time_ns += decode_ns
+            self.sound_futures.remove(future)
+            self.loaded += 1
+
+        while self.bundled_paths and perf_counter_ns() <= deadline:
+            image_cache.get(self.bundled_paths.pop())
+            self.loaded += 1
+
+        for future in [future for future in self.image_futures if future.done()]:
+            if perf_counter_ns() > deadline: break
+            path, image = future.result()
+            image_cache.put(path, image.convert_alpha())
+            self.image_futures.remove(future)
+            self.loaded += 1
+
+        if self.is_done() and self.executor:
+            self.executor.shutdown()
+            self.executor = None
+            self.load_time_ns = perf_counter_ns() - self.start_ns
+
+        return self.is_done()
+
+
+    # Loads everything before returning, for tools that have no frame to show progress in
+    def wait(self) -> None:
+        if not self.start_ns: self.start()
+
+        while not self.poll():
+            wait(self.image_futures + self.sound_futures)
+
+
+    def is_done(self) -> bool:
+        return not self.bundled_paths and not self.image_futures and not self.sound_futures
+
+
+    def get_progress(self) -> float:
+        return self.loaded / self.total if self.total else 1.0
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'assets': self.total,
+            'loaded': self.loaded,
+            'load_time_ms': self.load_time_ns // 1_000_000,
+        }
+
+
+    def __decode_image(self, path: str) -> tuple[str, Surface]:
+        return path, load_image(path)
+
+
+    def __decode_sound(self, name: str) -> tuple[str, Sound, int]:
+        start = perf_counter_ns()
+        sound = Sound(Paths.sound(name))
+        return name, sound, perf_counter_ns() - start
@@ -0,0 +1,75 @@
+from typing import Iterable
+from pygame import Rect, Surface
+from pygame.draw import rect as draw_rect
+
+from utils.settings import Layers
+
+
+# Collects the draw commands of a frame and sends them layer by layer, lowest layer first.
+# Within a layer commands go out in submission order, consecutive blits being batched into one Surface.blits call.
+class RenderQueue:
+    def __init__(self) -> None:
+        # Each layer holds lists of blits and (color, rect, width) tuples for rects
+        self.layers: dict[int, list[list[tuple[Surface, Rect | tuple]] | tuple[str, Rect, int]]] = {}
+        self.commands: int = 0
+        self.draw_calls: int = 0
+
+
+    def submit(self, surface: Surface, dest: Rect | tuple, layer: int = Layers.ui) -> None:
+        self.__get_blits(layer).append((surface, dest))
+
+
+    def submit_many(self, commands: Iterable[tuple[Surface, Rect | tuple]], layer: int = Layers.ui) -> None:
+        self.__get_blits(layer).extend(commands)
+
+
+    def submit_outline(self, color: str, rect: Rect, width: int, layer: int = Layers.ui) -> None:
+        self.layers.setdefault(layer, []).append((color, rect, width))
+
+
+    def submit_fill(self, color: str, rect: Rect, layer: int = Layers.ui) -> None:
+        self.layers.setdefault(layer, []).append((color, rect, 0))
+
+
+    # Counters cover every flush since the last call, which the engine makes at the start of each frame
+    def reset_counters(self) -> None:
+        self.commands = 0
+        self.draw_calls = 0
+
+
+    # Kept commands can be flushed again, e.g. once per clipped region, until clear is called
+    def flush(self, target: Surface, keep: bool = False) -> None:
+        for layer in sorted(self.layers):
+            for command in self.layers[layer]:
+                if isinstance(command, list):
+                    target.blits(command, False)
+                    self.commands += len(command)
+                else:
+                    color, rect, width = command
+                    draw_rect(target, color, rect, width)
+                    self.commands += 1
+
+                self.draw_calls += 1
+
+        if not keep: self.clear()
+
+
+    def clear(self) -> None:
+        self.layers.clear()
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'commands': self.commands,
+            'draw_calls': self.draw_calls,
+        }
+
+
+    # Blits submitted right after other blits join their batch, anything else in between starts a new one
+    def __get_blits(self, layer: int) -> list[tuple[Surface, Rect | tuple]]:
+        commands = self.layers.setdefault(layer, [])
+        if not commands or not isinstance(commands[-1], list): commands.append([])
+        return commands[-1]
+
+
+render_queue = RenderQueue()
@@ -2,10 +2,26 @@ from dataclasses import dataclass
 from os.path import join as os_path_join
 from pygame.font import Font, SysFont
 
+from utils.fonts import font_cache
+
 
 @dataclass(frozen=True)
 class Animations:
     speed: float = 0.15
+    menu_particles: int = 55
+
+
+@dataclass(frozen=True)
+class Atlases:
+    max_width: int = 4096
+    padding: int = 1
+
+
+@dataclass(frozen=True)
+class Bundles:
+    path: str = './data/assets.bundle'
+    magic: bytes = b'MEMBNDL2'
+    alignment: int = 16
 
 
 @dataclass(frozen=True)
@@ -14,14 +30,22 @@ class Buttons:
     y_offset_mid: float = 2.0
     x_offset_down: float = 3.0
     y_offset_down: float = 4.5
+    y_offset_board: float = 3.25
     padding_x = 200
     padding_y = 100
 
 
+@dataclass(frozen=True)
+class Caches:
+    image_budget_bytes: int = 64 * 1024 * 1024
+    text_cache_size: int = 256
+    scaled_images_path: str = './data/scaled'
+    smoothscale: bool = False
+
+
 @dataclass(frozen=True)
 class Cards:
     size: int = 160
-    amount: int = 32
     border_width = 2
 
 
@@ -43,6 +67,8 @@ class Decks:
     num_rows: int = 8
     padding: int = 10
     margin: int = 50
+    player_view_divider: int = 5
+    board_sizes: tuple[tuple[int, int], ...] = ((4, 4), (6, 6), (8, 8), (10, 10), (12, 12), (16, 16), (20, 20))
 
 
 @dataclass(frozen=True)
@@ -58,12 +84,27 @@ class Images:
     size_large: int = 240
 
 
+@dataclass(frozen=True)
+class Layers:
+    background: int = 0
+    effects: int = 1
+    board: int = 2
+    ui: int = 3
+    modal: int = 4
+
+
 @dataclass(frozen=True)
 class Mains:
     app_name: str = 'Memory Game'
     width: int = 2560
     height: int = 1440
     fps: int = 60
+    idle_timeout_ms: int = 500
+    simulation_rate: int = 60
+    max_frame_time_ms: int = 250
+    virtual_resolution: tuple = (2560, 1440)
+    dirty_rendering: bool = False
+    max_dirty_rects: int = 16
     surface_default_size: tuple = (64, 64)
 
 
@@ -79,6 +120,7 @@ class Fonts:
     large_font_size = 144
     medium_font_size = 72
     small_font_size = 36
+    overlay_font_size = 18
     
     padding_top = 200
     padding_bottom = 100
@@ -89,15 +131,19 @@ class Fonts:
 
     @classmethod
     def large(self) -> Font:
-        return Font(self.main_font_style, self.large_font_size)
+        return font_cache.get(self.main_font_style, self.large_font_size)
 
     @classmethod
     def medium(self) -> Font:
-        return Font(self.main_font_style, self.medium_font_size)
+        return font_cache.get(self.main_font_style, self.medium_font_size)
     
     @classmethod
     def small(self) -> Font:
-        return Font(self.main_font_style, self.small_font_size)
+        return font_cache.get(self.main_font_style, self.small_font_size)
+    
+    @classmethod
+    def overlay(self) -> Font:
+        return font_cache.get(self.main_font_style, self.overlay_font_size)
         
 
 @dataclass(frozen=True)
@@ -131,11 +177,38 @@ class Paths:
         return f'{os_path_join(self.sounds_path, sound)}.{self.sounds_format}'
 
 
+@dataclass(frozen=True)
+class Preloads:
+    workers: int = 4
+    poll_budget_ms: int = 8
+    image_formats: tuple[str, ...] = ('png', 'jpg', 'jpeg', 'bmp')
+    bar_width: int = 600
+    bar_height: int = 24
+
+
+@dataclass(frozen=True)
+class Profiling:
+    window_frames: int = 600
+    overlay_refresh_ms: int = 500
+    overlay_padding: int = 10
+    phases: tuple[str, ...] = ('machine', 'events', 'update', 'draw', 'flip', 'frame')
+
+
 @dataclass(frozen=True)
 class Screens:
     main_menu_id = 0
     player_info_id = 1
     game_view_id = 2
+    loading_id = 3
+
+
+@dataclass(frozen=True)
+class Selectors:
+    padding: int = 10
+    width_divider: int = 3
+    border_width: int = 2
+    scrollbar_width: int = 6
+    scroll_rows: int = 1
 
 
 @dataclass(frozen=True)
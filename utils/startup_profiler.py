@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from sys import meta_path
+from time import perf_counter_ns
+from typing import Iterator, Optional
+
+
+# Wraps the loader of a module so executing it, including the imports it makes, is timed
+class TimedLoader(Loader):
+    def __init__(self, loader: Loader, profiler: 'StartupProfiler', name: str) -> None:
+        self.loader = loader
+        self.profiler = profiler
+        self.name = name
+
+
+    def create_module(self, spec: ModuleSpec):
+        return self.loader.create_module(spec)
+
+
+    def exec_module(self, module) -> None:
+        with self.profiler.measure_import(self.name):
+            self.loader.exec_module(module)
+
+
+    def __getattr__(self, name: str):
+        return getattr(self.loader, name)
+
+
+# Sits first on sys.meta_path and lets the other finders locate modules, only swapping in a timed loader
+class ImportTimer(MetaPathFinder):
+    def __init__(self, profiler: 'StartupProfiler') -> None:
+        self.profiler = profiler
+
+
+    def find_spec(self, fullname: str, path, target=None) -> Optional[ModuleSpec]:
+        for finder in meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'): continue
+
+            spec: Optional[ModuleSpec] = finder.find_spec(fullname, path, target)
+            if spec is None: continue
+
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = TimedLoader(spec.loader, self.profiler, fullname)
+            return spec
+
+        return None
+
+
+# Collects import times per module and durations of named initialization steps.
+# Import times are inclusive of nested imports, self time leaves out the modules imported along the way.
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.import_timer: Optional[ImportTimer] = None
+        self.start_ns: int = 0
+        self.steps: list[tuple[str, int]] = []
+        self.imports: dict[str, tuple[int, int]] = {}
+        self.import_stack: list[list[int]] = []
+
+
+    # Enable before importing the modules to be measured
+    def enable(self) -> None:
+        self.enabled = True
+        self.start_ns = perf_counter_ns()
+        self.import_timer = ImportTimer(self)
+        meta_path.insert(0, self.import_timer)
+
+
+    def disable(self) -> None:
+        self.enabled = False
+
+        if self.import_timer in meta_path:
+            meta_path.remove(self.import_timer)
+
+
+    @contextmanager
+    def measure(self, step: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter_ns()
+        yield
+        self.steps.append((step, perf_counter_ns() - start))
+
+
+    @contextmanager
+    def measure_import(self, name: str) -> Iterator[None]:
+        # Each entry accumulates the time of the imports nested in it
+        self.import_stack.append([0])
+        start = perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            elapsed = perf_counter_ns() - start
+            nested = self.import_stack.pop()[0]
+            self.imports[name] = (elapsed, elapsed - nested)
+            if self.import_stack: self.import_stack[-1][0] += elapsed
+
+
+    def report(self, top: int = 25) -> str:
+        lines: list[str] = [f'startup {(perf_counter_ns() - self.start_ns) / 1_000_000:.1f} ms', '', f'{"step":<28} {"ms":>9}']
+
+        for step, elapsed in self.steps:
+            lines.append(f'{step:<28} {elapsed / 1_000_000:>9.1f}')
+
+        lines += ['', f'{"module":<48} {"total ms":>9} {"self ms":>9}']
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+
+        for name, (elapsed, own) in slowest:
+            lines.append(f'{name:<48} {elapsed / 1_000_000:>9.1f} {own / 1_000_000:>9.1f}')
+
+        lines.append(f'{len(self.imports)} modules imported, showing the {len(slowest)} slowest')
+        return '\n'.join(lines)
+
+
+startup_profiler = StartupProfiler()
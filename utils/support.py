@@ -1,17 +1,34 @@
 from inspect import stack
 from os import walk
 from pygame import Surface
-from pygame.image import load as load_image
 from typing import List, Optional, Union
 
+from utils.bundle import asset_bundle
+from utils.cache import image_cache
+from utils.settings import Preloads
+
+
+def get_image_paths(folder_path: str) -> List[str]:
+    return [
+        f'{folder}/{file}'
+        for folder, _, files in walk(folder_path)
+        for file in sorted(files)
+        if file.rsplit('.', 1)[-1].lower() in Preloads.image_formats
+    ]
+
+
 def get_graphics_images_from_folder(folder_path: str) -> Optional[List[Surface]]:
     try:
         images: list[Surface] = list()
+        bundled_paths: list[str] | None = asset_bundle.get_folder(folder_path)
+
+        if bundled_paths is not None:
+            return [image_cache.get(image_path) for image_path in bundled_paths]
         
         for _, __, img_files in walk(folder_path):
-            for image in img_files:
+            for image in sorted(img_files):
                 image_path: str = f'{folder_path}/{image}'
-                image_surface: Surface = load_image(image_path).convert_alpha()
+                image_surface: Surface = image_cache.get(image_path)
                 images.append(image_surface)
                 
         return images